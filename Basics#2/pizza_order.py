@@ -1,3 +1,7 @@
+import json
+import sys
+from collections import Counter
+
 MENU = {
     'Margherita': 20,
     'Pepperoni': 25,
@@ -13,6 +17,14 @@ TOPPINGS = {
     'szynka': 5,
 }
 
+# tabele po indeksie (numer z menu - 1) i nazwa -> indeks; liczone raz, nie przy każdym wyborze
+PIZZA_NAMES = tuple(MENU)
+PIZZA_PRICES = tuple(MENU.values())
+TOPPING_NAMES = tuple(TOPPINGS)
+TOPPING_PRICES = tuple(TOPPINGS.values())
+_PIZZA_IDX = {name: i for i, name in enumerate(PIZZA_NAMES)}
+_TOPPING_IDX = {name: i for i, name in enumerate(TOPPING_NAMES)}
+
 def show_menu():
     print("\n Menu Pizza:")
     for i, (name, price) in enumerate(MENU.items(), 1):
@@ -34,28 +46,160 @@ def order_pizza():
         print("Podaj liczbę")
         return None
 
-    pizza_name = list(MENU.keys())[choice - 1]
-    price = MENU[pizza_name]
-
-    toppings = set()
+    toppings = []
     show_toppings()
     raw = input("Wybierz numery dodatków (oddzielone spacją, Enter = brak): ")
     for r in [x for x in raw.split()]:
         try:
             idx = int(r)
             if 1 <= idx <= len(TOPPINGS):
-                toppings_name = list(TOPPINGS.keys())[idx - 1]
-                toppings.add(toppings_name)
+                toppings.append(idx - 1)
             else:
                 print(f"Nie ma dodatku {idx}")
         except ValueError:
             print(f"{r!r} to nie liczba")
 
-    return {"pizza": pizza_name, "toppings": tuple(toppings), "price": price + sum(TOPPINGS[e] for e in toppings)}
+    return price_item(choice - 1, toppings)
+
+
+def _index(value, names, lookup, what):
+    # numer z menu (int, od 1) albo nazwa (str) -> indeks w tabeli; True/1.0 to nie numer
+    if type(value) is int:
+        if 1 <= value <= len(names):
+            return value - 1
+    elif type(value) is str and value in lookup:
+        return lookup[value]
+    raise ValueError(f"Nie ma {what} {value!r}")
+
+_ITEM_CACHE = {}
+
+def price_item(pizza, toppings=()):
+    """Pizza i dodatki jako indeksy tabel (od 0); powtórzone dodatki liczone raz. Zwracany dict jest współdzielony - tylko do odczytu."""
+    key = (pizza, tuple(dict.fromkeys(toppings)))  # bez duplikatów, kolejność zachowana
+    # sprawdzane przed cache: ujemne indeksy "zawinęłyby się", a True / 1.0 trafiłyby we wpis dla 1
+    if not (type(pizza) is int and 0 <= pizza < len(PIZZA_NAMES)):
+        raise ValueError(f"Nie ma pizzy o indeksie {pizza!r}")
+    for t in key[1]:
+        if not (type(t) is int and 0 <= t < len(TOPPING_NAMES)):
+            raise ValueError(f"Nie ma dodatku o indeksie {t!r}")
+    item = _ITEM_CACHE.get(key)
+    if item is None:
+        pizza, tops = key
+        item = {
+            "pizza": PIZZA_NAMES[pizza],
+            "toppings": tuple(TOPPING_NAMES[t] for t in tops),
+            "price": PIZZA_PRICES[pizza] + sum(TOPPING_PRICES[t] for t in tops),
+        }
+        # klucze to pizza + uporządkowany podzbiór dodatków -> skończenie wiele, słownik nie rośnie bez końca
+        _ITEM_CACHE[key] = item
+    return item
+
+RAW_CACHE_SIZE = 10_000
+
+def _resolve(it, cache=None):
+    # pozycja z zamówienia -> (wyceniona pozycja, jej JSON, klucz (pizza, dodatki) w indeksach)
+    pizza, tops = it["pizza"], tuple(it.get("toppings", ()))
+    raw = None
+    # pamięć podręczna po surowych wartościach z pliku - tylko dla int/str (True == 1 == 1.0 skleiłoby klucze)
+    if cache is not None and type(pizza) in (int, str) and all(type(t) in (int, str) for t in tops):
+        raw = pizza, tops
+        hit = cache.get(raw)
+        if hit is not None:
+            return hit
+    p = _index(pizza, PIZZA_NAMES, _PIZZA_IDX, "pizzy")
+    item = price_item(p, [_index(t, TOPPING_NAMES, _TOPPING_IDX, "dodatku") for t in tops])
+    hit = (item, json.dumps(item, ensure_ascii=False), (p, item["toppings"]))
+    if raw is not None and len(cache) < RAW_CACHE_SIZE:  # ograniczona - dowolne listy dodatków nie zapełnią pamięci
+        cache[raw] = hit
+    return hit
+
+def price_order(items):
+    """Pozycje w formacie {"pizza": nazwa|numer, "toppings": [nazwa|numer, ...]} -> (pozycje z cenami, suma)."""
+    priced = [_resolve(it)[0] for it in items]
+    return priced, sum(it["price"] for it in priced)
+
+class Bill:
+    """Rachunek z bieżącą sumą - pokazanie go nie przelicza całej listy."""
+    def __init__(self):
+        self.items = []
+        self.total = 0
+
+    def add(self, item):
+        self.items.append(item)
+        self.total += item["price"]
+
+    def __len__(self):
+        return len(self.items)
+
+def describe(item):
+    return f"{item['pizza']} + {', '.join(item['toppings']) if item['toppings'] else 'bez dodatków'}"
+
+def price_orders_file(src_path, dst_path):
+    """
+    Wycenia plik zamówień JSONL, jedno zamówienie na linię:
+        {"id": 17, "items": [{"pizza": "Vesuvio", "toppings": ["ser", 2]}]}
+    (albo pojedyncza pozycja bez "items"). Do dst_path paragony JSONL, zwraca sumy zbiorcze.
+    Błędne linie trafiają do pliku jako {"line": n, "error": ...} i są liczone w "errors".
+    """
+    cache = {}
+    combos = Counter()  # liczymy wycenione pozycje (kombinacji jest mało), rozbijamy na pizze/dodatki na końcu
+    orders = errors = revenue = 0
+    with open(src_path, encoding='utf-8') as fin, open(dst_path, 'w', encoding='utf-8') as fout:
+        write = fout.write
+        for n, line in enumerate(fin, 1):
+            if not line.strip():
+                continue
+            try:
+                rec = json.loads(line)
+                hits = [_resolve(it, cache) for it in (rec["items"] if "items" in rec else [rec])]
+                order_id = json.dumps(rec.get("id", n), ensure_ascii=False)
+            except (ValueError, KeyError, TypeError, AttributeError) as e:
+                errors += 1
+                write(json.dumps({"line": n, "error": str(e)}, ensure_ascii=False) + "\n")
+                continue
+            total = 0
+            for item, _, key in hits:
+                total += item["price"]
+                combos[key] += 1
+            orders += 1
+            revenue += total
+            # paragon sklejany z gotowych fragmentów JSON pozycji - bez ponownej serializacji
+            write(f'{{"id": {order_id}, "items": [{", ".join([enc for _, enc, _ in hits])}], "total": {total}}}\n')
+    pizzas = Counter()
+    toppings = Counter()
+    for (p, tops), k in combos.items():
+        pizzas[PIZZA_NAMES[p]] += k
+        for t in tops:
+            toppings[t] += k
+    return {
+        "orders": orders,
+        "pizzas": sum(pizzas.values()),
+        "revenue": revenue,
+        "errors": errors,
+        "by_pizza": dict(pizzas.most_common()),
+        "by_topping": dict(toppings.most_common()),
+    }
 
+def make_sample(path, n=100_000, seed=1):
+    """Przykładowy plik zamówień do testów wydajności."""
+    import random
+    rng = random.Random(seed)
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(n):
+            items = [{"pizza": rng.choice(PIZZA_NAMES),
+                      "toppings": rng.sample(TOPPING_NAMES, rng.randint(0, 3))}
+                     for _ in range(rng.randint(1, 4))]
+            f.write(json.dumps({"id": i, "items": items}, ensure_ascii=False) + "\n")
+    return path
 
 def main():
-    order_list = []
+    # python pizza_order.py --bulk zamówienia.jsonl paragony.jsonl
+    if sys.argv[1:2] == ['--bulk']:
+        src_path, dst_path = sys.argv[2:4]
+        summary = price_orders_file(src_path, dst_path)
+        print(json.dumps(summary, ensure_ascii=False, indent=2))
+        return
+    bill = Bill()
     while True:
         print("\n   MENU   ")
         print("[1] Zamów pizze\n[2] Pokaż rachunek\n[3] Wyjdź")
@@ -68,19 +212,16 @@ def main():
         if choice == 1:
             order = order_pizza()
             if order:
-                order_list.append(order)
-                print(
-                    f"Dodano {order['pizza']} + {', '.join(order['toppings']) if order['toppings'] else 'bez dodatków'}")
+                bill.add(order)
+                print(f"Dodano {describe(order)}")
         elif choice == 2:
-            if not order_list:
+            if not bill:
                 print("Brak zamówień.")
             else:
-                total = sum(o["price"] for o in order_list)
                 print("\nRachunek:")
-                for i, o in enumerate(order_list, 1):
-                    print(
-                        f"{i}. {o['pizza']} + {', '.join(o['toppings']) if o['toppings'] else 'bez dodatków'} -> {o['price']} zł")
-                print(f"--- Razem: {total} zł ---")
+                for i, o in enumerate(bill.items, 1):
+                    print(f"{i}. {describe(o)} -> {o['price']} zł")
+                print(f"--- Razem: {bill.total} zł ---")
         elif choice == 3:
             print("Smacznego!")
             break
@@ -88,4 +229,4 @@ def main():
             print("Podaj numer 1–3.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,3 +1,10 @@
+import json
+import mmap
+import os
+import random
+import sys
+from array import array
+
 QUESTIONS = [
     {"q": "Co zwraca len('abc')?", "ans": ["2", "3", "4"], "correct": 2},
     {"q": "Jaki typ ma {'a':1}?", "ans": ["list", "set", "dict"], "correct": 3},
@@ -18,14 +25,229 @@ def ask(q):
         except ValueError:
             print("To nie jest liczba, podaj liczbę 1-{0}".format(len(q["ans"])))
             continue
-        if 1 < pick <= len(q["ans"]):
+        if 1 <= pick <= len(q["ans"]):
             return pick == q["correct"]
         else:
             print("Poza zakresem. Wpisz 1-{0}".format(len(q["ans"])))
 
+# Baza pytań w pliku JSONL, jedno pytanie na linię:
+#     {"q": "...", "ans": ["a", "b", "c"], "correct": 2, "tags": ["python"], "difficulty": 1}
+# Obok indeks (<plik>.idx): offsety linii, trudność, klucz odpowiedzi i listy numerów pytań per tag.
+# Losowanie czyta z bazy tylko wylosowane rekordy; ocenianie arkuszy korzysta tylko z indeksu.
+
+INDEX_VERSION = 1
+
+class QuestionBank:
+    def __init__(self, path, index_path=None):
+        self.path = str(path)
+        self.index_path = index_path or self.path + ".idx"
+        if not self._load_index():
+            self.build_index()
+        self._by_difficulty = None
+        self._fh = open(self.path, "rb")
+        # pusty plik nie da się zmapować
+        self._mm = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ) if len(self) else b""
+
+    def close(self):
+        if isinstance(self._mm, mmap.mmap):
+            self._mm.close()
+        self._fh.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return len(self.difficulty)
+
+    def _stamp(self):
+        st = os.stat(self.path)
+        return [st.st_size, st.st_mtime_ns]
+
+    def build_index(self):
+        """Jedno przejście po bazie; zapisuje indeks obok pliku."""
+        offsets = array("q")
+        difficulty = array("B")
+        key = array("B")
+        tags = {}
+        pos = 0
+        with open(self.path, "rb") as f:
+            for n, line in enumerate(f, 1):
+                start = pos
+                pos += len(line)
+                if not line.strip():
+                    continue
+                try:
+                    rec = json.loads(line)
+                    correct = rec["correct"]
+                    if not 1 <= correct <= len(rec["ans"]):
+                        raise ValueError(f"poprawna odpowiedź {correct} poza zakresem")
+                    rec_tags = rec.get("tags", [])
+                    if not isinstance(rec_tags, list) or not all(isinstance(t, str) for t in rec_tags):
+                        raise ValueError(f"tags musi być listą tekstów, jest {rec_tags!r}")
+                    i = len(key)
+                    key.append(correct)
+                    difficulty.append(rec.get("difficulty", 0))
+                    for t in rec_tags:
+                        tags.setdefault(t, array("I")).append(i)
+                except (ValueError, KeyError, TypeError, OverflowError) as e:
+                    raise ValueError(f"Błędne pytanie w linii {n}: {e}")
+                offsets.append(start)
+        offsets.append(pos)  # koniec ostatniego rekordu
+        self.offsets, self.difficulty, self.key, self.tags = offsets, difficulty, key, tags
+        self._save_index()
+
+    def _save_index(self):
+        header = {"version": INDEX_VERSION, "bank": self._stamp(), "n": len(self.key),
+                  "tags": [[t, len(ids)] for t, ids in self.tags.items()]}
+        tmp = self.index_path + ".part"
+        with open(tmp, "wb") as f:
+            f.write(json.dumps(header, ensure_ascii=False).encode() + b"\n")
+            self.offsets.tofile(f)
+            self.difficulty.tofile(f)
+            self.key.tofile(f)
+            for ids in self.tags.values():
+                ids.tofile(f)
+        os.replace(tmp, self.index_path)
+
+    def _load_index(self):
+        # False -> brak indeksu albo nieaktualny (baza zmieniła się od budowy)
+        try:
+            f = open(self.index_path, "rb")
+        except FileNotFoundError:
+            return False
+        with f:
+            try:
+                header = json.loads(f.readline())
+                if header.get("version") != INDEX_VERSION or header.get("bank") != self._stamp():
+                    return False
+                n = header["n"]
+                self.offsets = array("q")
+                self.offsets.fromfile(f, n + 1)
+                self.difficulty = array("B")
+                self.difficulty.fromfile(f, n)
+                self.key = array("B")
+                self.key.fromfile(f, n)
+                self.tags = {}
+                for t, count in header["tags"]:
+                    ids = self.tags[t] = array("I")
+                    ids.fromfile(f, count)
+            except (ValueError, KeyError, EOFError):
+                return False
+        return True
+
+    def get(self, i):
+        """Pytanie nr i (od 0) - czyta tylko jego rekord."""
+        q = json.loads(self._mm[self.offsets[i]:self.offsets[i + 1]])
+        q["id"] = i
+        return q
+
+    def candidates(self, tag=None, difficulty=None):
+        """Numery pytań z tagiem i/lub trudnością (liczba albo zakres (od, do) włącznie)."""
+        if difficulty is not None:
+            lo, hi = difficulty if isinstance(difficulty, tuple) else (difficulty, difficulty)
+        if tag is not None:
+            ids = self.tags.get(tag, array("I"))
+            if difficulty is None:
+                return ids
+            d = self.difficulty
+            return [i for i in ids if lo <= d[i] <= hi]
+        if difficulty is None:
+            return range(len(self))
+        if self._by_difficulty is None:
+            by = {}
+            for i, d in enumerate(self.difficulty):
+                by.setdefault(d, array("I")).append(i)
+            self._by_difficulty = by
+        groups = [ids for d, ids in self._by_difficulty.items() if lo <= d <= hi]
+        return groups[0] if len(groups) == 1 else sorted(i for ids in groups for i in ids)
+
+    def sample(self, n, tag=None, difficulty=None, rng=random):
+        ids = self.candidates(tag, difficulty)
+        if n > len(ids):
+            raise ValueError(f"Za mało pytań: {len(ids)} pasujących, potrzeba {n}")
+        return [self.get(i) for i in rng.sample(ids, n)]
+
+    def grade(self, answers):
+        """answers = {nr_pytania: wybrana odpowiedź} (klucze mogą być tekstem, jak w JSON) -> (wynik, błędne)."""
+        key = self.key
+        ids = list(map(int, answers))
+        if ids and min(ids) < 0:  # ujemny indeks array liczyłby od końca
+            raise IndexError(f"Nie ma pytania {min(ids)}")
+        wrong = [i for i, pick in zip(ids, answers.values()) if key[i] != pick]
+        return len(ids) - len(wrong), wrong
+
+    def grade_file(self, sheets_path, results_path):
+        """
+        Ocenia arkusze JSONL {"id": ..., "answers": {"17": 2, ...}} -> wyniki JSONL; zwraca podsumowanie.
+        Odpowiedzi porównywane z kluczem z indeksu, bez czytania treści pytań.
+        """
+        sheets = errors = points = asked = 0
+        with open(sheets_path, encoding="utf-8") as fin, open(results_path, "w", encoding="utf-8") as fout:
+            write = fout.write
+            for n, line in enumerate(fin, 1):
+                if not line.strip():
+                    continue
+                try:
+                    sheet = json.loads(line)
+                    answers = sheet["answers"]
+                    score, wrong = self.grade(answers)
+                except (ValueError, KeyError, TypeError, IndexError, AttributeError) as e:
+                    errors += 1
+                    write(json.dumps({"line": n, "error": str(e)}, ensure_ascii=False) + "\n")
+                    continue
+                sheets += 1
+                points += score
+                asked += len(answers)
+                write(json.dumps({"id": sheet.get("id", n), "score": score, "total": len(answers),
+                                  "wrong": wrong}, ensure_ascii=False) + "\n")
+        return {"sheets": sheets, "errors": errors, "points": points, "answers": asked,
+                "accuracy": round(points / asked, 4) if asked else 0.0}
+
+def make_sample_bank(path, n=200_000, seed=7):
+    """Syntetyczna baza pytań do testów wydajności."""
+    rng = random.Random(seed)
+    tags = ["python", "typy", "petle", "funkcje", "klasy", "wyjatki", "moduly", "io"]
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(n):
+            k = rng.randint(2, 5)
+            f.write(json.dumps({"q": f"Pytanie {i}?", "ans": [f"odp {j}" for j in range(1, k + 1)],
+                                "correct": rng.randint(1, k), "tags": rng.sample(tags, rng.randint(1, 3)),
+                                "difficulty": rng.randint(1, 5)}, ensure_ascii=False) + "\n")
+    return path
+
+def make_sample_sheets(bank, path, n=100_000, per_sheet=20, seed=8):
+    """Arkusze z losowymi odpowiedziami (~połowa poprawnych) do testów ocen."""
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as f:
+        for s in range(n):
+            answers = {}
+            for i in rng.sample(range(len(bank)), per_sheet):
+                answers[i] = bank.key[i] if rng.random() < 0.5 else 0
+            f.write(json.dumps({"id": s, "answers": answers}) + "\n")
+    return path
+
 def main():
-    score = sum(1 for q in QUESTIONS if ask(q))
-    print(f"Wynik: {score}/{len(QUESTIONS)}")
+    # python quiz.py                                          - wbudowane pytania, po kolei
+    # python quiz.py --bank baza.jsonl [N] [tag] [trudność]   - N losowych pytań z bazy
+    # python quiz.py --grade baza.jsonl arkusze.jsonl wyniki.jsonl
+    args = sys.argv[1:]
+    if args[:1] == ["--grade"]:
+        with QuestionBank(args[1]) as bank:
+            print(json.dumps(bank.grade_file(args[2], args[3]), ensure_ascii=False))
+        return
+    if args[:1] == ["--bank"]:
+        n = int(args[2]) if len(args) > 2 else 10
+        tag = args[3] if len(args) > 3 and args[3] != "-" else None
+        difficulty = int(args[4]) if len(args) > 4 else None
+        with QuestionBank(args[1]) as bank:
+            questions = bank.sample(n, tag, difficulty)
+    else:
+        questions = QUESTIONS
+    score = sum(1 for q in questions if ask(q))
+    print(f"Wynik: {score}/{len(questions)}")
 
 if __name__ == "__main__":
     main()
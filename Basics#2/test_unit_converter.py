@@ -0,0 +1,54 @@
+import pytest
+
+import unit_converter as uc
+
+
+def test_convert_exact_temperature_and_length():
+    assert uc.convert(100, 'C', 'F') == 212.0
+    assert uc.convert(212, 'F', 'C') == 100.0
+    assert uc.convert(12, 'm', 'cm') == 1200.0
+
+
+def test_convert_rejects_mixed_dimensions():
+    with pytest.raises(ValueError, match="Nie można przeliczyć"):
+        uc.convert(1, 'm', 's')
+
+
+def test_convert_many_list_matches_convert():
+    assert uc.convert_many([0, 37.5, -40], 'C', 'F') == [uc.convert(v, 'C', 'F') for v in (0, 37.5, -40)]
+
+
+def test_convert_many_numpy_is_vectorized():
+    np = pytest.importorskip("numpy")
+    values = np.array([0.0, 37.5, -40.0])
+    out = uc.convert_many(values, 'C', 'F')
+    assert isinstance(out, np.ndarray)
+    assert out.tolist() == [uc.convert(v, 'C', 'F') for v in values.tolist()]
+    assert uc.convert_many(values, 'm', 'cm').tolist() == [0.0, 3750.0, -4000.0]
+
+
+def _write(path, text):
+    path.write_text(text, encoding='utf-8')
+    return path
+
+
+def test_convert_csv_streams_in_chunks(tmp_path):
+    src = _write(tmp_path / "in.csv", "id,len,temp\n1,100,0\n2,250,100\n3,1_000,-40\n")
+    dst = tmp_path / "out.csv"
+    assert uc.convert_csv(src, dst, {'len': ('cm', 'm'), 'temp': ('C', 'F')}, chunk_rows=2) == 3
+    assert dst.read_text(encoding='utf-8').splitlines() == [
+        "id,len,temp", "1,1.0,32.0", "2,2.5,212.0", "3,10.0,-40.0"]
+
+
+@pytest.mark.parametrize("text, message", [
+    ("", "Pusty plik CSV"),
+    ("id,len\n1,100\n2\n", "Za mało kolumn w wierszu 3"),
+    ("id,len\n1,100\n2,abc\n", "Nieprawidłowa liczba w kolumnie 'len'"),
+])
+def test_convert_csv_errors_keep_destination(tmp_path, text, message):
+    src = _write(tmp_path / "in.csv", text)
+    dst = _write(tmp_path / "out.csv", "previous\n")
+    with pytest.raises(ValueError, match=message):
+        uc.convert_csv(src, dst, {'len': ('cm', 'm')}, chunk_rows=1)
+    assert dst.read_text(encoding='utf-8') == "previous\n"
+    assert not (tmp_path / "out.csv.part").exists()
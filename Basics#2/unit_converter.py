@@ -1,8 +1,38 @@
-UNITS = {
-    'm': 1.0, 'cm': 0.01, 'mm': 0.001,
-    'km': 1000.0, 'in': 0.0254, 'ft': 0.3048
+import csv
+import os
+import sys
+from fractions import Fraction
+from itertools import islice
+
+# jednostka -> (wymiar, skala, przesunięcie):  wartość_w_bazie = wartość * skala + przesunięcie
+# bazy: m, kg, s, K; stałe jako dokładne ułamki (Fraction), do float dopiero współczynniki par
+REGISTRY = {
+    # długość
+    'm': ('length', '1'), 'cm': ('length', '0.01'), 'mm': ('length', '0.001'),
+    'km': ('length', '1000'), 'in': ('length', '0.0254'), 'ft': ('length', '0.3048'),
+    'yd': ('length', '0.9144'), 'mi': ('length', '1609.344'),
+    # masa
+    'kg': ('mass', '1'), 'g': ('mass', '0.001'), 'mg': ('mass', '0.000001'),
+    't': ('mass', '1000'), 'lb': ('mass', '0.45359237'), 'oz': ('mass', '0.028349523125'),
+    # czas
+    's': ('time', '1'), 'ms': ('time', '0.001'), 'min': ('time', '60'),
+    'h': ('time', '3600'), 'd': ('time', '86400'),
+    # temperatura (z przesunięciem)
+    'K': ('temperature', '1'), 'C': ('temperature', '1', '273.15'),
+    'F': ('temperature', '5/9', '45967/180'),  # (F + 459.67) * 5/9
+}
+_EXACT = {u: (dim, Fraction(scale), Fraction(offset[0] if offset else 0))
+          for u, (dim, scale, *offset) in REGISTRY.items()}
+UNITS = {u: float(scale) for u, (dim, scale, _) in _EXACT.items() if dim == 'length'}  # jak dawniej: tylko długości
+VALID = set(REGISTRY)
+
+# każda para w obrębie wymiaru policzona z góry: dst = src * a + b  -> konwersja to jedno wyszukanie
+_PAIRS = {
+    (src, dst): (float(s1 / s2), float((o1 - o2) / s2))
+    for src, (d1, s1, o1) in _EXACT.items()
+    for dst, (d2, s2, o2) in _EXACT.items()
+    if d1 == d2
 }
-VALID = set(UNITS)
 
 def safe_float(s: str) -> float:
     try:
@@ -10,12 +40,84 @@ def safe_float(s: str) -> float:
     except ValueError:
         raise ValueError(f"Nieprawidłowa liczba: {s!r}")
 
-def convert(value: float, src: str, dst: str) -> float:
+def _pair(src: str, dst: str) -> tuple:
+    try:
+        return _PAIRS[src, dst]
+    except KeyError:
+        pass
     if src not in VALID or dst not in VALID:
         raise ValueError(f"Dozwolone jednostki to: {sorted(VALID)}")
-    return value * UNITS[src] / UNITS[dst]
+    raise ValueError(f"Nie można przeliczyć {REGISTRY[src][0]} ({src}) na {REGISTRY[dst][0]} ({dst})")
+
+def convert(value: float, src: str, dst: str) -> float:
+    a, b = _pair(src, dst)
+    return value * a + b
+
+def convert_many(values, src: str, dst: str):
+    """Tablice NumPy (i wszystko z __array__) liczone wektorowo w jednym przebiegu; inne iterowalne -> lista."""
+    a, b = _pair(src, dst)
+    if hasattr(values, '__array__'):
+        return values * a + b if b else values * a
+    return [v * a + b for v in values]
+
+def convert_csv(src_path, dst_path, conversions: dict, chunk_rows: int = 50_000) -> int:
+    """
+    Strumieniowo przelicza kolumny pliku CSV: conversions = {kolumna: (z, na)}.
+    Paczki po chunk_rows wierszy -> pamięć stała niezależnie od rozmiaru pliku. Zwraca liczbę wierszy.
+    Wynik trafia najpierw do <dst_path>.part - przy błędzie dst_path zostaje nietknięty.
+    """
+    pairs = {col: _pair(s, d) for col, (s, d) in conversions.items()}
+    tmp = f"{dst_path}.part"
+    try:
+        rows_done = _convert_csv_into(src_path, tmp, pairs, chunk_rows)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    os.replace(tmp, dst_path)
+    return rows_done
+
+def _convert_csv_into(src_path, dst_path, pairs: dict, chunk_rows: int) -> int:
+    rows_done = 0
+    with open(src_path, newline='', encoding='utf-8') as fin, \
+         open(dst_path, 'w', newline='', encoding='utf-8') as fout:
+        reader = csv.reader(fin)
+        writer = csv.writer(fout)
+        header = next(reader, None)
+        if header is None:
+            raise ValueError(f"Pusty plik CSV: {src_path}")
+        missing = set(pairs) - set(header)
+        if missing:
+            raise ValueError(f"Brak kolumn w pliku: {sorted(missing)}")
+        writer.writerow(header)
+        idx = [(header.index(col), a, b) for col, (a, b) in pairs.items()]
+        while rows := list(islice(reader, chunk_rows)):
+            for i, a, b in idx:
+                # cała kolumna paczki naraz: map(float) w C, potem jedno wyrażenie na wartość
+                try:
+                    col = list(map(float, [r[i] for r in rows]))
+                except IndexError:
+                    j = next(j for j, r in enumerate(rows) if len(r) <= i)
+                    raise ValueError(f"Za mało kolumn w wierszu {rows_done + j + 2}: "
+                                     f"{len(rows[j])} zamiast {len(header)}")
+                except ValueError as e:
+                    raise ValueError(f"Nieprawidłowa liczba w kolumnie {header[i]!r} (wiersze {rows_done + 2}..): {e}")
+                for r, v in zip(rows, col):
+                    r[i] = repr(v * a + b)
+            writer.writerows(rows)
+            rows_done += len(rows)
+    return rows_done
 
 def main():
+    # python unit_converter.py --csv wejście.csv wyjście.csv kolumna:cm:m [kolumna:C:F ...]
+    if sys.argv[1:2] == ['--csv']:
+        src_path, dst_path, *specs = sys.argv[2:]
+        conversions = {}
+        for spec in specs:
+            col, src, dst = spec.rsplit(':', 2)
+            conversions[col] = (src, dst)
+        print(f"Przeliczono {convert_csv(src_path, dst_path, conversions)} wierszy")
+        return
     raw = input("Podaj wartość do konwersji, jednostkę źródłową i jednostkę docelową (np. '12 cm m'): ")
     try:
         val_s, src, dst = raw.split()
@@ -26,4 +128,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-
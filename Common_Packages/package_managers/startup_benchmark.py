@@ -0,0 +1,112 @@
+# package_managers/startup_benchmark.py
+"""
+Benchmark czasu startu weather_cli (metryka regresji).
+    python startup_benchmark.py                  # tabela
+    python startup_benchmark.py --json           # jedna linia JSON (do CI / historii)
+    python startup_benchmark.py --budget-ms 50   # exit 1, gdy import przekroczy budżet
+Mierzy:
+    - import weather_cli (szybka ścieżka) wg `python -X importtime`,
+    - import + zbudowanie aplikacji typer/rich (tryb interaktywny),
+    - pełne wywołanie `weather_cli.py --json now <miasto>` z ciepłym cache (stub, bez sieci).
+"""
+from __future__ import annotations
+import argparse
+import importlib.util
+import json
+import os
+import py_compile
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+
+
+def import_time_us(code: str, module: str | None = "weather_cli") -> tuple[int, dict[str, int]]:
+    """
+    Uruchamia `python -X importtime -c code`.
+    Zwraca (cumulative µs modułu, self µs modułów z jego poddrzewa importów).
+    module=None -> suma wszystkich importów (też tych zrobionych później w kodzie).
+    """
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          cwd=HERE, capture_output=True, text=True, check=True)
+    cumulative = 0
+    pending: dict[str, int] = {}
+    self_times: dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cum_us, raw = line[len("import time:"):].split("|")
+        name = raw.strip()
+        pending[name] = int(self_us)
+        if module is None:
+            self_times[name] = int(self_us)
+            cumulative += int(self_us)
+        elif not raw[1:].startswith(" "):  # moduł najwyższego poziomu zamyka swoje poddrzewo
+            if name == module:
+                cumulative, self_times = int(cum_us), pending
+            pending = {}
+    return cumulative, self_times
+
+
+def wall_time_ms(args: list[str], env: dict[str, str] | None = None) -> float:
+    t0 = time.perf_counter()
+    subprocess.run([sys.executable, *args], cwd=HERE, env=env, capture_output=True, check=True)
+    return (time.perf_counter() - t0) * 1e3
+
+
+def benchmark(runs: int = 7) -> dict[str, float]:
+    # jak po instalacji: z gotowym .pyc (inaczej mierzymy też kompilację źródła)
+    py_compile.compile(str(HERE / "weather_cli.py"), cfile=importlib.util.cache_from_source(str(HERE / "weather_cli.py")))
+    fast = [import_time_us("import weather_cli") for _ in range(runs)]
+    full = [import_time_us("import weather_cli; weather_cli._typer_app()", module=None)[0] for _ in range(runs)]
+
+    import stub_server
+    server = stub_server.start()
+    with tempfile.TemporaryDirectory() as cache_dir:
+        env = {**os.environ, "WEATHER_CLI_API_BASE": f"http://127.0.0.1:{server.server_port}",
+               "WEATHER_CLI_CACHE_DIR": cache_dir}
+        cmd = ["weather_cli.py", "--json", "now", "Warsaw"]
+        wall_time_ms(cmd, env)  # rozgrzanie cache
+        cli = [wall_time_ms(cmd, env) for _ in range(runs)]
+    server.shutdown()
+    baseline = [wall_time_ms(["-c", "pass"]) for _ in range(runs)]
+
+    heaviest = sorted(fast[0][1].items(), key=lambda kv: -kv[1])[:5]
+    return {
+        "import_fast_ms": statistics.median(c for c, _ in fast) / 1e3,
+        "import_interactive_ms": statistics.median(full) / 1e3,
+        "cli_json_cached_ms": statistics.median(cli),
+        "python_startup_ms": statistics.median(baseline),  # pusty interpreter - punkt odniesienia
+        "heaviest_imports": {name: us / 1e3 for name, us in heaviest},
+    }
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--runs", type=int, default=7)
+    ap.add_argument("--json", action="store_true", help="print one JSON line")
+    ap.add_argument("--budget-ms", type=float, help="fail if the fast-path import exceeds this")
+    args = ap.parse_args()
+
+    res = benchmark(args.runs)
+    if args.json:
+        print(json.dumps(res))
+    else:
+        for k, v in res.items():
+            if isinstance(v, dict):
+                print(f"{k}:")
+                for name, ms in v.items():
+                    print(f"  {name:<30} {ms:8.2f} ms (self)")
+            else:
+                print(f"{k:<24} {v:8.2f} ms")
+    if args.budget_ms is not None and res["import_fast_ms"] > args.budget_ms:
+        print(f"REGRESSION: import {res['import_fast_ms']:.2f} ms > budget {args.budget_ms} ms", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
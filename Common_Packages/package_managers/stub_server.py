@@ -0,0 +1,119 @@
+# package_managers/stub_server.py
+"""
+Lokalny zamiennik Open-Meteo do uruchamiania weather_cli offline.
+    python stub_server.py --port 8765 --delay 0.2
+    WEATHER_CLI_API_BASE=http://127.0.0.1:8765 python weather_cli.py multi Warsaw Berlin
+Odpowiedzi są deterministyczne (wyliczone z nazwy miasta / współrzędnych);
+miasta zaczynające się od "nowhere" nie istnieją, a od "error" kończą się błędem 500.
+server.stats liczy połączenia TCP i zapytania per ścieżka (do testów puli połączeń).
+"""
+from __future__ import annotations
+import argparse
+from collections import Counter
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def _seed(text: str) -> int:
+    return int(hashlib.md5(text.encode()).hexdigest()[:8], 16)
+
+def geocode_body(name: str) -> dict:
+    if name.lower().startswith("nowhere"):
+        return {}
+    s = _seed(name.lower())
+    return {"results": [{
+        "name": name.title(), "country_code": "XX",
+        "latitude": round(-60 + s % 12000 / 100, 4),
+        "longitude": round(-180 + (s >> 8) % 36000 / 100, 4),
+    }]}
+
+def forecast_body(q: dict[str, str]) -> dict:
+    s = _seed(f'{q.get("latitude")},{q.get("longitude")}')
+    body: dict = {"latitude": float(q.get("latitude", 0)), "longitude": float(q.get("longitude", 0))}
+    if "current" in q:
+        body["current"] = {
+            "temperature_2m": round(s % 400 / 10 - 10, 1),
+            "wind_speed_10m": round(s % 300 / 10, 1),
+            "relative_humidity_2m": s % 100,
+        }
+    if "daily" in q:
+        days = int(q.get("forecast_days", 7))
+        body["daily"] = {
+            "time": [time.strftime("%Y-%m-%d", time.gmtime(time.time() + 86400 * d)) for d in range(days)],
+            "temperature_2m_min": [round((s >> d) % 200 / 10 - 5, 1) for d in range(days)],
+            "temperature_2m_max": [round((s >> d) % 200 / 10 + 5, 1) for d in range(days)],
+            "precipitation_sum": [round((s >> d) % 50 / 10, 1) for d in range(days)],
+        }
+    return body
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    delay = 0.0
+    max_age = 600
+    protocol_version = "HTTP/1.1"  # keep-alive, żeby było widać zysk z puli połączeń
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def _count(self, what: str) -> None:
+        with self.server.stats_lock:
+            self.server.stats[what] += 1
+
+    def setup(self) -> None:
+        super().setup()
+        self._count("connections")  # jeden handler na połączenie; keep-alive = wiele zapytań
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        q = {k: v[0] for k, v in parse_qs(url.query).items()}
+        self._count(url.path)
+        if url.path == "/v1/search" and q.get("name", "").lower().startswith("error"):
+            self.send_error(500)
+            return
+        if url.path == "/v1/search":
+            body = geocode_body(q.get("name", ""))
+        elif url.path == "/v1/forecast":
+            body = forecast_body(q)
+        else:
+            self.send_error(404)
+            return
+        if self.delay:
+            time.sleep(self.delay)
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Cache-Control", f"max-age={self.max_age}")
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def start(port: int = 0, delay: float = 0.0) -> ThreadingHTTPServer:
+    """Uruchamia serwer w wątku tła (port=0 -> wolny port, patrz server.server_port)."""
+    handler = type("Handler", (StubHandler,), {"delay": delay})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    server.stats = Counter()
+    server.stats_lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Open-Meteo stub for weather_cli")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--delay", type=float, default=0.0, help="artificial latency per request (s)")
+    args = ap.parse_args()
+    server = start(args.port, args.delay)
+    print(f"Stub listening on http://127.0.0.1:{server.server_port} (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
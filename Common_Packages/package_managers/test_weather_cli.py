@@ -0,0 +1,133 @@
+import json
+import os
+from pathlib import Path
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+import stub_server
+
+CLI = Path(__file__).with_name("weather_cli.py")
+
+
+@pytest.fixture
+def server():
+    srv = stub_server.start(0)
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+@pytest.fixture
+def env(server, tmp_path):
+    return {**os.environ,
+            "WEATHER_CLI_API_BASE": f"http://127.0.0.1:{server.server_port}",
+            "WEATHER_CLI_CACHE_DIR": str(tmp_path / "cache")}
+
+
+def run_cli(env, *args, stdin=None):
+    proc = subprocess.run([sys.executable, str(CLI), "--json", *args], env=env, input=stdin,
+                          capture_output=True, text=True, timeout=30)
+    return proc.returncode, [json.loads(ln) for ln in proc.stdout.splitlines()]
+
+
+def test_multi_returns_records_in_input_order(env):
+    cities = ["Warsaw", "Berlin", "Paris", "Rome", "Madrid"]
+    code, rows = run_cli(env, "multi", *cities, "--workers", "4")
+    assert code == 0
+    assert [r["city"] for r in rows] == cities
+    for r in rows:
+        assert r["name"] == stub_server.geocode_body(r["city"])["results"][0]["name"] + ", XX"
+        assert "temperature_2m" in r
+
+
+def test_multi_reports_missing_city_and_server_error_per_record(env):
+    code, rows = run_cli(env, "multi", "Warsaw", "Nowhereville", "ErrorCity")
+    assert code == 0
+    by_city = {r["city"]: r for r in rows}
+    assert "error" not in by_city["Warsaw"]
+    assert by_city["Nowhereville"]["error"] == "city not found"
+    assert by_city["ErrorCity"]["error"] == "network error: HTTPError"
+
+
+def test_multi_reuses_pooled_connections(env, server):
+    cities = [f"City{i}" for i in range(24)]
+    code, rows = run_cli(env, "multi", *cities, "--workers", "4")
+    assert code == 0 and len(rows) == 24
+    requests_made = server.stats["/v1/search"] + server.stats["/v1/forecast"]
+    assert requests_made == 48
+    # wspólna sesja z pulą keep-alive: najwyżej jedno połączenie na wątek, nie jedno na zapytanie
+    assert server.stats["connections"] <= 4
+
+
+def test_multi_second_run_is_served_from_cache(env, server):
+    run_cli(env, "multi", "Warsaw", "Berlin")
+    before = sum(server.stats.values())
+    code, rows = run_cli(env, "multi", "Warsaw", "Berlin")
+    assert code == 0 and len(rows) == 2
+    assert sum(server.stats.values()) == before
+
+
+# --- batch (stream_weather) ---
+
+@pytest.fixture
+def slow_server():
+    srv = stub_server.start(0, delay=0.2)
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def test_batch_geocodes_repeated_cities_once(slow_server, tmp_path):
+    env = {**os.environ, "WEATHER_CLI_API_BASE": f"http://127.0.0.1:{slow_server.server_port}",
+           "WEATHER_CLI_CACHE_DIR": str(tmp_path / "cache")}
+    cities = ["Warsaw", "Berlin", "warsaw", " Warsaw ", "BERLIN", "Paris"]
+    # --no-cache: wszystkie zapytania naraz w locie, więc powtórki łączy tylko memo (single-flight)
+    code, rows = run_cli(env, "--no-cache", "batch", "--workers", "8", stdin="\n".join(cities) + "\n")
+    assert code == 0 and len(rows) == 6
+    assert slow_server.stats["/v1/search"] == 3
+    assert slow_server.stats["/v1/forecast"] == 6
+
+
+def test_batch_emits_records_before_input_ends(env):
+    proc = subprocess.Popen([sys.executable, str(CLI), "--json", "batch"], env=env, text=True,
+                            stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+    try:
+        proc.stdin.write("Warsaw\n")
+        proc.stdin.flush()
+        first = []
+        reader = threading.Thread(target=lambda: first.append(proc.stdout.readline()), daemon=True)
+        reader.start()
+        reader.join(10)  # stdin nadal otwarte - rekord musi przyjść bez EOF
+        assert first and json.loads(first[0])["city"] == "Warsaw"
+        proc.stdin.write("Berlin\n")
+        proc.stdin.close()
+        rest = [json.loads(ln) for ln in proc.stdout.read().splitlines()]
+        assert [r["city"] for r in rest] == ["Berlin"]
+        assert proc.wait(10) == 0
+    finally:
+        proc.kill()
+
+
+def test_batch_seq_skips_blank_and_comment_lines(env):
+    stdin = "Warsaw\n\n# komentarz\nBerlin\n   \nParis\nNowhereville\n"
+    code, rows = run_cli(env, "batch", "--workers", "4", stdin=stdin)
+    assert code == 0
+    assert sorted((r["seq"], r["city"]) for r in rows) == [
+        (0, "Warsaw"), (1, "Berlin"), (2, "Paris"), (3, "Nowhereville")]
+    assert rows[[r["city"] for r in rows].index("Nowhereville")]["error"] == "city not found"
+    # jeden wątek: kolejność ukończenia = kolejność wejścia
+    code, rows = run_cli(env, "batch", "--workers", "1", stdin=stdin)
+    assert [r["seq"] for r in rows] == [0, 1, 2, 3]
+
+
+def test_not_found_city_is_cached_briefly(env, tmp_path):
+    import weather_cli
+    run_cli(env, "batch", stdin="Nowhereville\nWarsaw\n")
+    entries = {e["key"]: e["expires"] - time.time()
+               for e in (json.loads(p.read_text()) for p in (tmp_path / "cache").glob("*.json"))}
+    assert entries["geocode:nowhereville"] <= weather_cli.NOT_FOUND_TTL
+    assert entries["geocode:warsaw"] > weather_cli.NOT_FOUND_TTL
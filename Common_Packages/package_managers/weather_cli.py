@@ -1,81 +1,458 @@
 # package_managers/weather_cli.py
+"""
+Weather CLI (Open-Meteo).
+Start ma być szybki, bo zwykle robimy 1-2 zapytania HTTP (albo zero - cache):
+    - requests importowany dopiero przy pierwszym zapytaniu sieciowym,
+    - typer + rich tylko w trybie interaktywnym (tabele w terminalu),
+    - --json albo wyjście nie-TTY (pipe, plik) -> argparse + json ze stdlib.
+Pomiar: python startup_benchmark.py
+"""
 from __future__ import annotations
+import hashlib
+import json
+import os
 import sys
-from typing import Tuple, Optional
-import requests
-import typer
-from rich import print
-from rich.table import Table
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, List, Mapping, Tuple, Optional
 
-app = typer.Typer(add_completion=False, help="Weather CLI (Open-Meteo)")
+if TYPE_CHECKING:
+    import requests
 
-GEOCODE_URL = "https://geocoding-api.open-meteo.com/v1/search"
-FORECAST_URL = "https://api.open-meteo.com/v1/forecast"
+# WEATHER_CLI_API_BASE=http://127.0.0.1:8765 -> lokalny stub (stub_server.py) zamiast Open-Meteo
+API_BASE = os.environ.get("WEATHER_CLI_API_BASE", "").rstrip("/")
+GEOCODE_URL = f"{API_BASE}/v1/search" if API_BASE else "https://geocoding-api.open-meteo.com/v1/search"
+FORECAST_URL = f"{API_BASE}/v1/forecast" if API_BASE else "https://api.open-meteo.com/v1/forecast"
+CURRENT_FIELDS = "temperature_2m,wind_speed_10m,relative_humidity_2m"
+DAILY_FIELDS = "temperature_2m_max,temperature_2m_min,precipitation_sum"
 
-def geocode(city: str) -> Tuple[float, float, str]:
-    """Zwraca (lat, lon, resolved_name) dla podanego miasta."""
-    r = requests.get(GEOCODE_URL, params={"name": city, "count": 1, "language": "en", "format": "json"}, timeout=10)
+CACHE_DIR = Path(os.environ.get("WEATHER_CLI_CACHE_DIR") or Path.home() / ".cache" / "weather-cli")
+GEOCODE_TTL = 30 * 24 * 3600   # współrzędne miast praktycznie się nie zmieniają
+NOT_FOUND_TTL = 10 * 60        # "nie znaleziono" krótko - literówka / chwilowy brak nie zostaje na miesiąc
+FORECAST_TTL = 10 * 60         # gdy serwer nie poda Cache-Control/Expires
+COORD_PRECISION = 2            # ~1 km - sąsiednie zapytania trafiają w ten sam wpis
+
+class ResponseCache:
+    """Cache odpowiedzi JSON na dysku: jeden plik na klucz + czas wygaśnięcia."""
+    def __init__(self, root: Path, read: bool = True, write: bool = True):
+        self.root = root
+        self.read = read
+        self.write = write
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{hashlib.sha256(key.encode()).hexdigest()[:32]}.json"
+
+    def get(self, key: str) -> Optional[Any]:
+        if not self.read:
+            return None
+        try:
+            entry = json.loads(self._path(key).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if entry.get("expires", 0) < time.time():
+            return None
+        return entry.get("data")
+
+    def set(self, key: str, data: Any, ttl: float) -> None:
+        if not self.write or ttl <= 0:
+            return
+        path = self._path(key)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps({"key": key, "expires": time.time() + ttl, "data": data}), encoding="utf-8")
+            os.replace(tmp, path)  # atomowo - równoległe procesy nie zobaczą połowy pliku
+        except OSError:
+            pass  # cache jest tylko optymalizacją
+
+_cache = ResponseCache(CACHE_DIR)
+
+class CityNotFound(LookupError):
+    pass
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+def get_session(pool_size: int = 10) -> requests.Session:
+    """Wspólna sesja HTTP: keep-alive, bez ponownego DNS/TCP/TLS dla kolejnych zapytań."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+        return _session
+
+def ttl_from_headers(headers: Mapping[str, str], default: float) -> float:
+    """TTL wg Cache-Control (no-store/no-cache/max-age - Age) albo Expires - Date."""
+    from email.utils import parsedate_to_datetime
+    cc = headers.get("Cache-Control", "").lower()
+    directives = {d.strip().partition("=")[0]: d.strip().partition("=")[2] for d in cc.split(",") if d.strip()}
+    if "no-store" in directives or "no-cache" in directives:
+        return 0
+    if "max-age" in directives:
+        try:
+            return int(directives["max-age"]) - int(headers.get("Age", 0))
+        except ValueError:
+            return default
+    if "Expires" in headers:
+        try:
+            expires = parsedate_to_datetime(headers["Expires"])
+            date = parsedate_to_datetime(headers["Date"]) if "Date" in headers else None
+            now = date.timestamp() if date else time.time()
+            return expires.timestamp() - now
+        except (TypeError, ValueError):
+            return 0  # niepoprawne Expires = już wygasło (RFC 9111)
+    return default
+
+def get_json(url: str, params: dict, *, key: str, ttl: float | Callable[[Any], float],
+             honor_headers: bool = False) -> Any:
+    """
+    GET z cache: trafienie nie dotyka sieci; TTL z nagłówków HTTP gdy honor_headers.
+    ttl może być funkcją odpowiedzi (np. krótszy TTL dla pustego wyniku).
+    """
+    data = _cache.get(key)
+    if data is not None:
+        return data
+    r = get_session().get(url, params=params, timeout=10)
     r.raise_for_status()
     data = r.json()
+    if callable(ttl):
+        ttl = ttl(data)
+    _cache.set(key, data, ttl_from_headers(r.headers, ttl) if honor_headers else ttl)
+    return data
+
+def fetch_forecast(lat: float, lon: float, params: dict) -> dict:
+    """Zapytanie do API prognozy; klucz cache = zaokrąglone lat/lon + parametry."""
+    lat, lon = round(lat, COORD_PRECISION), round(lon, COORD_PRECISION)
+    full = {"latitude": lat, "longitude": lon, **params}
+    key = "forecast:" + json.dumps(full, sort_keys=True)
+    return get_json(FORECAST_URL, full, key=key, ttl=FORECAST_TTL, honor_headers=True)
+
+def configure_cache(no_cache: bool = False, refresh: bool = False) -> None:
+    _cache.read = not (no_cache or refresh)
+    _cache.write = not no_cache
+
+def is_network_error(e: BaseException) -> bool:
+    """Błąd requests? Bez importu requests - jeśli nie jest załadowany, to nie mógł go rzucić."""
+    requests = sys.modules.get("requests")
+    return requests is not None and isinstance(e, requests.RequestException)
+
+def resolve_city(city: str) -> Tuple[float, float, str]:
+    """Zwraca (lat, lon, resolved_name); CityNotFound gdy API nic nie znalazło."""
+    params = {"name": city, "count": 1, "language": "en", "format": "json"}
+    data = get_json(GEOCODE_URL, params, key=f"geocode:{city.strip().lower()}",
+                    ttl=lambda d: GEOCODE_TTL if d.get("results") else NOT_FOUND_TTL)
     results = data.get("results") or []
     if not results:
-        typer.secho(f"City not found: {city}", err=True, fg=typer.colors.RED)
-        raise typer.Exit(code=1)
+        raise CityNotFound(city)
     item = results[0]
     name = f'{item["name"]}, {item.get("country_code","")}'
     return float(item["latitude"]), float(item["longitude"]), name
 
-@app.command()
-def now(city: str = typer.Argument(..., help="City name, e.g. 'Warsaw'")):
-    """Pokaż bieżącą pogodę."""
-    lat, lon, name = geocode(city)
-    params = {
-        "latitude": lat, "longitude": lon,
-        "current": "temperature_2m,wind_speed_10m,relative_humidity_2m",
-        "timezone": "auto",
-    }
-    r = requests.get(FORECAST_URL, params=params, timeout=10)
-    r.raise_for_status()
-    cur = r.json().get("current") or {}
-    table = Table(title=f"Current weather — {name}")
-    table.add_column("Metric"); table.add_column("Value")
-    table.add_row("Temperature", f'{cur.get("temperature_2m","?")} °C')
-    table.add_row("Wind", f'{cur.get("wind_speed_10m","?")} km/h')
-    table.add_row("Humidity", f'{cur.get("relative_humidity_2m","?")} %')
-    print(table)
-
-@app.command()
-def forecast(
-    city: str = typer.Argument(..., help="City name, e.g. 'Warsaw'"),
-    days: int = typer.Option(3, min=1, max=14, help="How many days (1–14)"),
-):
-    """Pokaż prognozę dzienną na N dni."""
-    lat, lon, name = geocode(city)
-    params = {
-        "latitude": lat, "longitude": lon,
-        "daily": "temperature_2m_max,temperature_2m_min,precipitation_sum",
-        "timezone": "auto",
-        "forecast_days": days,
-    }
-    r = requests.get(FORECAST_URL, params=params, timeout=10)
-    r.raise_for_status()
-    data = r.json().get("daily") or {}
+def current_weather(lat: float, lon: float) -> dict:
+    return fetch_forecast(lat, lon, {"current": CURRENT_FIELDS, "timezone": "auto"}).get("current") or {}
 
-    dates = data.get("time", [])
-    tmax = data.get("temperature_2m_max", [])
-    tmin = data.get("temperature_2m_min", [])
-    rain = data.get("precipitation_sum", [])
+Resolver = Callable[[str], Tuple[float, float, str]]
 
-    table = Table(title=f"Forecast — {name} (next {days} day(s))")
-    for col in ("Date", "Min °C", "Max °C", "Rain mm"):
-        table.add_column(col)
-    for d, lo, hi, rr in zip(dates, tmin, tmax, rain):
-        table.add_row(d, f"{lo:.1f}", f"{hi:.1f}", f"{rr:.1f}")
-    print(table)
+class ResolveMemo:
+    """
+    Ograniczony (LRU) memo geocode z single-flight - powtórzone miasta
+    w strumieniu = jedno zapytanie, także gdy pierwsze jeszcze trwa.
+    Zapamiętywane są tylko znalezione miasta; "nie znaleziono" i błędy sieci
+    dostają tylko czekający na to samo zapytanie (dalej decyduje krótki
+    NOT_FOUND_TTL w cache dyskowym), więc długi strumień nie trzyma literówki.
+    """
+    def __init__(self, maxsize: int = 10_000, resolve: Resolver = resolve_city):
+        from collections import OrderedDict
+        from concurrent.futures import Future
+        self._future = Future
+        self._resolve = resolve
+        self._memo: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.maxsize = maxsize
 
-if __name__ == "__main__":
+    def __call__(self, city: str) -> Tuple[float, float, str]:
+        key = city.strip().lower()
+        with self._lock:
+            fut = self._memo.get(key)
+            leader = fut is None
+            if leader:
+                fut = self._memo[key] = self._future()
+                if len(self._memo) > self.maxsize:
+                    self._memo.popitem(last=False)  # czekający nadal trzymają swój Future
+            else:
+                self._memo.move_to_end(key)
+        if leader:
+            try:
+                fut.set_result(self._resolve(city))
+            except BaseException as e:
+                with self._lock:
+                    if self._memo.get(key) is fut:
+                        del self._memo[key]
+                fut.set_exception(e)
+        return fut.result()
+
+def now_record(city: str, resolve: Resolver = resolve_city) -> dict:
+    """Bieżąca pogoda jako płaski słownik (wspólny dla tabel i JSON)."""
+    lat, lon, name = resolve(city)
+    return {"city": city, "name": name, "latitude": lat, "longitude": lon, **current_weather(lat, lon)}
+
+def forecast_record(city: str, days: int, resolve: Resolver = resolve_city) -> dict:
+    lat, lon, name = resolve(city)
+    params = {"daily": DAILY_FIELDS, "timezone": "auto", "forecast_days": days}
+    data = fetch_forecast(lat, lon, params).get("daily") or {}
+    rows = zip(data.get("time", []), data.get("temperature_2m_min", []),
+               data.get("temperature_2m_max", []), data.get("precipitation_sum", []))
+    return {"city": city, "name": name, "latitude": lat, "longitude": lon,
+            "daily": [{"date": d, "min": lo, "max": hi, "rain": rr} for d, lo, hi, rr in rows]}
+
+def city_weather(city: str, days: int = 0, resolve: Resolver = resolve_city) -> dict:
+    """now_record (albo forecast_record gdy days > 0) dla wątków: błędy jako pole 'error'."""
+    try:
+        return forecast_record(city, days, resolve) if days else now_record(city, resolve)
+    except CityNotFound:
+        return {"city": city, "error": "city not found"}
+    except Exception as e:
+        if not is_network_error(e):
+            raise
+        return {"city": city, "error": f"network error: {e.__class__.__name__}"}
+
+def fetch_many(cities: List[str], workers: int = 8) -> List[dict]:
+    """Równoległe pobieranie (pula wątków + wspólna sesja). Wyniki w kolejności wejścia."""
+    from concurrent.futures import ThreadPoolExecutor
+    get_session(pool_size=workers)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(city_weather, cities))
+
+def stream_weather(cities: Iterable[str], workers: int = 8, days: int = 0,
+                   memo_size: int = 10_000) -> Iterator[dict]:
+    """
+    Strumień rekordów dla (dowolnie długiego) strumienia nazw miast.
+    Rekord wychodzi, gdy tylko jego dane dotrą (kolejność ukończenia, pole 'seq' =
+    numer na wejściu) - także gdy wejście (np. stdin) akurat milczy: wejście czyta
+    osobny wątek. Pamięć ograniczona: najwyżej 4*workers zadań w locie
+    i memo geocode na memo_size miast.
+    """
+    import queue
+    from concurrent.futures import ThreadPoolExecutor
+    resolve = ResolveMemo(memo_size)
+    get_session(pool_size=workers)
+    done: queue.Queue = queue.Queue()  # ukończone futures + na końcu ("end", liczba zadań, błąd wejścia)
+    slots = threading.BoundedSemaphore(4 * workers)
+    stop = threading.Event()
+
+    def job(seq: int, city: str) -> dict:
+        return {"seq": seq, **city_weather(city, days, resolve)}
+
+    def feed(pool: ThreadPoolExecutor) -> None:
+        seq = 0
+        error: Optional[BaseException] = None
+        try:
+            for line in cities:
+                city = line.strip()
+                if not city or city.startswith("#"):
+                    continue
+                while not slots.acquire(timeout=0.1):  # limit zadań w locie; co 0.1 s sprawdzamy stop
+                    if stop.is_set():
+                        return
+                if stop.is_set():
+                    return
+                pool.submit(job, seq, city).add_done_callback(done.put)
+                seq += 1
+        except BaseException as e:  # błąd odczytu wejścia -> zgłoszony w wątku konsumenta
+            error = e
+        finally:
+            done.put(("end", seq, error))
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        feeder = threading.Thread(target=feed, args=(pool,), name="weather-input", daemon=True)
+        feeder.start()
+        total: Optional[int] = None
+        emitted = 0
+        try:
+            while total is None or emitted < total:
+                item = done.get()
+                if isinstance(item, tuple):
+                    _, total, error = item
+                    if error is not None:
+                        raise error
+                    continue
+                slots.release()
+                emitted += 1
+                yield item.result()
+        finally:
+            stop.set()  # przerwany odbiorca (albo błąd) -> wątek wejścia nie zleca nowych zadań
+
+def read_cities(path: Path) -> List[str]:
+    """Jedno miasto na linię; puste linie i komentarze (#) pomijane."""
+    lines = path.read_text(encoding="utf-8").splitlines()
+    return [ln.strip() for ln in lines if ln.strip() and not ln.lstrip().startswith("#")]
+
+# --- szybka ścieżka: JSON / nie-TTY (tylko stdlib) ---
+
+def _emit(records: Iterable[dict]) -> None:
+    out = sys.stdout
+    for rec in records:
+        out.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        out.flush()  # odbiorca w potoku dostaje rekord od razu
+
+def _build_parser():
+    import argparse
+    p = argparse.ArgumentParser(prog="weather", description="Weather CLI (Open-Meteo), JSON output")
+    p.add_argument("--json", action="store_true", help="JSON output (default when stdout is not a TTY)")
+    p.add_argument("--no-cache", action="store_true", help="Don't read or write the local cache")
+    p.add_argument("--refresh", action="store_true", help="Ignore cached data, fetch fresh and update the cache")
+    sub = p.add_subparsers(dest="cmd", required=True)
+    sp = sub.add_parser("now", help="Current weather")
+    sp.add_argument("city")
+    sp = sub.add_parser("forecast", help="Daily forecast for N days")
+    sp.add_argument("city")
+    sp.add_argument("--days", type=int, default=3, choices=range(1, 15), metavar="1-14")
+    sp = sub.add_parser("multi", help="Current weather for many cities (JSON Lines)")
+    sp.add_argument("cities", nargs="*")
+    sp.add_argument("--file", "-f", type=Path)
+    sp.add_argument("--workers", type=int, default=8, choices=range(1, 65), metavar="1-64")
+    sp = sub.add_parser("batch", help="Stream JSON Lines for cities read from stdin or a file")
+    sp.add_argument("source", nargs="?", default="-", help="file with one city per line ('-' = stdin)")
+    sp.add_argument("--days", type=int, default=0, choices=range(0, 15), metavar="0-14",
+                    help="0 = current weather, N = daily forecast for N days")
+    sp.add_argument("--workers", type=int, default=8, choices=range(1, 65), metavar="1-64")
+    return p
+
+def _fast_main(argv: List[str]) -> int:
+    # flagi globalne wolno podać w dowolnym miejscu (argparse przyjąłby je tylko przed komendą)
+    flags = {"--json", "--no-cache", "--refresh"}
+    present = flags.intersection(argv)
+    args = _build_parser().parse_args([a for a in argv if a not in flags])
+    configure_cache("--no-cache" in present, "--refresh" in present)
+    try:
+        if args.cmd == "now":
+            _emit([now_record(args.city)])
+        elif args.cmd == "forecast":
+            _emit([forecast_record(args.city, args.days)])
+        elif args.cmd == "batch":
+            if args.source == "-":
+                _emit(stream_weather(sys.stdin, args.workers, args.days))
+            else:
+                with open(args.source, encoding="utf-8") as fh:
+                    _emit(stream_weather(fh, args.workers, args.days))
+        else:
+            names = list(args.cities) + (read_cities(args.file) if args.file else [])
+            if not names:
+                print("Give at least one city or --file", file=sys.stderr)
+                return 1
+            _emit(fetch_many(names, workers=args.workers))
+    except CityNotFound as e:
+        print(f"City not found: {e}", file=sys.stderr)
+        return 1
+    except BrokenPipeError:
+        # odbiorca zamknął potok (np. `| head`) - wyciszamy dalsze zapisy
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    return 0
+
+# --- tryb interaktywny: typer + rich ---
+
+def _typer_app():
+    import typer
+    from rich import print
+    from rich.table import Table
+
+    tapp = typer.Typer(add_completion=False, help="Weather CLI (Open-Meteo). Use --json (or pipe the output) for JSON.")
+
+    def _not_found(city: str) -> typer.Exit:
+        typer.secho(f"City not found: {city}", err=True, fg=typer.colors.RED)
+        return typer.Exit(code=1)
+
+    @tapp.callback()
+    def main(
+        no_cache: bool = typer.Option(False, "--no-cache", help="Don't read or write the local cache"),
+        refresh: bool = typer.Option(False, "--refresh", help="Ignore cached data, fetch fresh and update the cache"),
+    ):
+        """Weather CLI (Open-Meteo) z lokalnym cache odpowiedzi."""
+        configure_cache(no_cache, refresh)
+
+    @tapp.command()
+    def now(city: str = typer.Argument(..., help="City name, e.g. 'Warsaw'")):
+        """Pokaż bieżącą pogodę."""
+        try:
+            cur = now_record(city)
+        except CityNotFound:
+            raise _not_found(city)
+        table = Table(title=f"Current weather — {cur['name']}")
+        table.add_column("Metric"); table.add_column("Value")
+        table.add_row("Temperature", f'{cur.get("temperature_2m","?")} °C')
+        table.add_row("Wind", f'{cur.get("wind_speed_10m","?")} km/h')
+        table.add_row("Humidity", f'{cur.get("relative_humidity_2m","?")} %')
+        print(table)
+
+    @tapp.command()
+    def forecast(
+        city: str = typer.Argument(..., help="City name, e.g. 'Warsaw'"),
+        days: int = typer.Option(3, min=1, max=14, help="How many days (1–14)"),
+    ):
+        """Pokaż prognozę dzienną na N dni."""
+        try:
+            rec = forecast_record(city, days)
+        except CityNotFound:
+            raise _not_found(city)
+        table = Table(title=f"Forecast — {rec['name']} (next {days} day(s))")
+        for col in ("Date", "Min °C", "Max °C", "Rain mm"):
+            table.add_column(col)
+        for d in rec["daily"]:
+            table.add_row(d["date"], f'{d["min"]:.1f}', f'{d["max"]:.1f}', f'{d["rain"]:.1f}')
+        print(table)
+
+    @tapp.command()
+    def multi(
+        cities: Optional[List[str]] = typer.Argument(None, help="City names, e.g. Warsaw Berlin Paris"),
+        file: Optional[Path] = typer.Option(None, "--file", "-f", exists=True, dir_okay=False,
+                                            help="File with one city per line"),
+        workers: int = typer.Option(8, min=1, max=64, help="Max concurrent requests"),
+    ):
+        """Bieżąca pogoda dla wielu miast naraz (zapytania równoległe)."""
+        names = list(cities or [])
+        if file:
+            names += read_cities(file)
+        if not names:
+            typer.secho("Give at least one city or --file", err=True, fg=typer.colors.RED)
+            raise typer.Exit(code=1)
+
+        t0 = time.perf_counter()
+        rows = fetch_many(names, workers=workers)
+        dt = time.perf_counter() - t0
+
+        table = Table(title=f"Current weather — {len(rows)} cities ({dt:.2f}s, {workers} workers)")
+        for col in ("City", "Temperature", "Wind", "Humidity"):
+            table.add_column(col)
+        for row in rows:
+            if "error" in row:
+                table.add_row(row["city"], f'[red]{row["error"]}[/red]', "", "")
+            else:
+                table.add_row(row["name"], f'{row.get("temperature_2m","?")} °C',
+                              f'{row.get("wind_speed_10m","?")} km/h', f'{row.get("relative_humidity_2m","?")} %')
+        print(table)
+
+    return tapp
+
+def app(argv: Optional[List[str]] = None) -> None:
+    """Punkt wejścia skryptu `weather` (pyproject: weather_cli:app)."""
+    argv = sys.argv[1:] if argv is None else list(argv)
     try:
-        app()
-    except requests.RequestException as e:
-        typer.secho(f"Network error: {e}", err=True, fg=typer.colors.RED)
+        command = next((a for a in argv if not a.startswith("-")), None)
+        if "--json" in argv or command == "batch" or not sys.stdout.isatty():
+            sys.exit(_fast_main(argv))
+        _typer_app()(args=argv, prog_name="weather")
+    except Exception as e:
+        if not is_network_error(e):
+            raise
+        print(f"Network error: {e}", file=sys.stderr)
         sys.exit(2)
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,243 @@
+# comprehensions/text_sketch.py
+"""
+Tryb przybliżony analizy: pamięć ograniczona niezależnie od wielkości słownika.
+    - top-k: Space-Saving (tablica `capacity` liczników, błąd <= N / capacity),
+    - unique_words: HyperLogLog (błąd względny ~1.04 / sqrt(2**p)).
+Oba szkice da się scalać, więc shardy / procesy liczą osobno i wynik jest łączony.
+    python text_sketch.py --bench        # dokładność i pamięć vs tryb dokładny
+"""
+from __future__ import annotations
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+import hashlib
+import heapq
+import io
+import math
+import mmap
+from pathlib import Path
+import sys
+from typing import Iterable, Mapping
+
+from text_analyzer import WORD_RE, Report, _line_aligned_ranges, analyze
+
+
+class SpaceSaving:
+    """
+    Heavy hitters w stałej pamięci (wariant "paczkowy", scalany).
+    Słowo spoza tablicy startuje od `floor` (górna granica jego dotychczasowej liczby);
+    po przekroczeniu pojemności zostaje `capacity` największych, a floor = największa
+    odrzucona liczba. Oszacowanie: true <= count <= true + err, err <= floor <= N / capacity.
+    """
+    def __init__(self, capacity: int) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self.capacity = capacity
+        self.counts: dict[str, int] = {}
+        self.errors: dict[str, int] = {}
+        self.floor = 0
+
+    @classmethod
+    def for_error(cls, epsilon: float) -> "SpaceSaving":
+        """Pojemność dla błędu liczby <= epsilon * N."""
+        return cls(math.ceil(1 / epsilon))
+
+    def update(self, batch: Mapping[str, int]) -> None:
+        counts, errors, floor = self.counts, self.errors, self.floor
+        for w, c in batch.items():
+            if w in counts:
+                counts[w] += c
+            else:
+                counts[w] = floor + c
+                errors[w] = floor
+        if len(counts) > self.capacity:
+            self._trim()
+
+    def _trim(self) -> None:
+        # (capacity + 1) największych: ostatni z nich to największy odrzucony
+        keep = heapq.nlargest(self.capacity + 1, self.counts.items(), key=lambda kv: kv[1])
+        self.floor = max(self.floor, keep.pop()[1])
+        self.counts = dict(keep)
+        self.errors = {w: self.errors[w] for w in self.counts}
+
+    def merge(self, other: "SpaceSaving") -> "SpaceSaving":
+        """Suma dwóch szkiców; brakujące słowo po danej stronie liczone jako jej floor."""
+        out = SpaceSaving(max(self.capacity, other.capacity))
+        for w in self.counts.keys() | other.counts.keys():
+            out.counts[w] = self.counts.get(w, self.floor) + other.counts.get(w, other.floor)
+            out.errors[w] = self.errors.get(w, self.floor) + other.errors.get(w, other.floor)
+        out.floor = self.floor + other.floor
+        if len(out.counts) > out.capacity:
+            out._trim()
+        return out
+
+    def top(self, k: int = 10) -> list[tuple[str, int]]:
+        return heapq.nlargest(k, self.counts.items(), key=lambda kv: kv[1])
+
+    def guaranteed(self, k: int = 10) -> list[str]:
+        """Słowa, które na pewno są w prawdziwym top-k (dolna granica >= oszacowanie k+1-szego)."""
+        top = self.top(k + 1)
+        bar = top[k][1] if len(top) > k else self.floor
+        return [w for w, c in top[:k] if c - self.errors[w] >= bar]
+
+
+class HyperLogLog:
+    """
+    Liczba różnych słów w 2**p bajtach. Hash blake2b (64 bity) - stabilny między
+    procesami (wbudowany hash() str jest losowany per proces, więc nie nadaje się do scalania).
+    """
+    def __init__(self, p: int = 14) -> None:
+        if not 4 <= p <= 18:
+            raise ValueError("p must be in 4..18")
+        self.p = p
+        self.m = 1 << p
+        self.registers = bytearray(self.m)
+
+    @classmethod
+    def for_error(cls, rel_error: float) -> "HyperLogLog":
+        """Najmniejsze p z błędem standardowym 1.04 / sqrt(m) <= rel_error."""
+        return cls(min(18, max(4, math.ceil(2 * math.log2(1.04 / rel_error)))))
+
+    def update(self, words: Iterable[str]) -> None:
+        regs, p, shift = self.registers, self.p, 64 - self.p
+        mask = (1 << shift) - 1
+        for w in words:
+            h = int.from_bytes(hashlib.blake2b(w.encode(), digest_size=8).digest(), "big")
+            idx, rest = h >> shift, h & mask
+            rank = shift - rest.bit_length() + 1
+            if rank > regs[idx]:
+                regs[idx] = rank
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        if self.p != other.p:
+            raise ValueError("cannot merge HyperLogLog sketches with different p")
+        out = HyperLogLog(self.p)
+        out.registers = bytearray(map(max, self.registers, other.registers))
+        return out
+
+    def estimate(self) -> int:
+        m = self.m
+        alpha = {16: 0.673, 32: 0.697, 64: 0.709}.get(m, 0.7213 / (1 + 1.079 / m))
+        raw = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if raw <= 2.5 * m and zeros:
+            return round(m * math.log(m / zeros))  # linear counting dla małych liczności
+        return round(raw)
+
+
+@dataclass
+class Sketch:
+    """Odpowiednik _Partial dla trybu przybliżonego - stała pamięć, scalany."""
+    top: SpaceSaving
+    uniques: HyperLogLog
+    lines: int = 0
+    words: int = 0
+    chars: int = 0
+
+    @classmethod
+    def new(cls, top_error: float = 1e-4, unique_error: float = 0.01) -> "Sketch":
+        return cls(SpaceSaving.for_error(top_error), HyperLogLog.for_error(unique_error))
+
+    def tally(self, text: str, lines: int) -> None:
+        batch = Counter(map(str.lower, WORD_RE.findall(text)))  # ograniczone rozmiarem paczki
+        self.lines += lines
+        self.words += batch.total()
+        self.chars += sum(len(w) * c for w, c in batch.items())
+        self.top.update(batch)
+        self.uniques.update(batch)  # hash raz na różne słowo w paczce, nie na wystąpienie
+
+    def merge(self, other: "Sketch") -> "Sketch":
+        return Sketch(self.top.merge(other.top), self.uniques.merge(other.uniques),
+                      self.lines + other.lines, self.words + other.words, self.chars + other.chars)
+
+    def report(self) -> Report:
+        avg = self.chars / self.words if self.words else 0.0
+        return Report(self.lines, self.words, self.uniques.estimate(), avg, self.top.top(10))
+
+
+def _sketch_fh(fh: io.TextIOBase, top_error: float, unique_error: float, block: int = 1 << 20) -> Sketch:
+    sk = Sketch.new(top_error, unique_error)
+    while lines := fh.readlines(block):
+        sk.tally("".join(lines), len(lines))
+    return sk
+
+def _sketch_range(path: str, start: int, end: int, top_error: float, unique_error: float) -> Sketch:
+    with open(path, "rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        text = mm[start:end].decode("utf-8")
+    return _sketch_fh(io.StringIO(text, newline=None), top_error, unique_error)
+
+def analyze_approx(path: str | Path, *, top_error: float = 1e-4, unique_error: float = 0.01,
+                   workers: int = 1, min_parallel_bytes: int = 8 << 20) -> Report:
+    """
+    Jak analyze(), ale top_10 i unique_words przybliżone w stałej pamięci:
+    liczby w top_10 zawyżone o <= top_error * total_words, unique_words z błędem
+    standardowym ~unique_error. Lines / words / avg_word_len są dokładne.
+    """
+    path = Path(path)
+    if workers > 1 and path.stat().st_size >= max(1, min_parallel_bytes):  # pustego pliku nie da się zmapować
+        with path.open("rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            ranges = _line_aligned_ranges(mm, workers * 4)
+        n = len(ranges)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_sketch_range, [str(path)] * n, *zip(*ranges),
+                                  [top_error] * n, [unique_error] * n))
+        total = parts[0]
+        for p in parts[1:]:
+            total = total.merge(p)
+        return total.report()
+    with path.open("r", encoding="utf-8") as fh:
+        return _sketch_fh(fh, top_error, unique_error).report()
+
+
+def benchmark(size_mb: int = 8, vocab: int = 300_000, seed: int = 7) -> list[dict]:
+    """Tryb dokładny vs przybliżony: czas, szczyt pamięci (tracemalloc), błąd unique, trafność top-10."""
+    import random
+    import tempfile
+    import time
+    import tracemalloc
+    rng = random.Random(seed)
+    words = [f"w{i}" for i in range(vocab)]
+    weights = [1 / (i + 1) for i in range(vocab)]  # Zipf(1) - jak język naturalny
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "zipf.txt"
+        with path.open("w", encoding="utf-8") as fh:
+            written = 0
+            while written < size_mb << 20:
+                line = " ".join(rng.choices(words, weights, k=2_000)) + "\n"
+                written += fh.write(line)
+        runs = [("exact", lambda: analyze(path))]
+        for te, ue in [(1e-3, 0.02), (1e-4, 0.01), (1e-5, 0.005)]:
+            runs.append((f"approx top_err={te:g} uniq_err={ue:g}",
+                         lambda te=te, ue=ue: analyze_approx(path, top_error=te, unique_error=ue)))
+        exact = None
+        for name, fn in runs:
+            tracemalloc.start()
+            t0 = time.perf_counter()
+            rep = fn()
+            elapsed = time.perf_counter() - t0
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            exact = exact or rep
+            true_top = {w for w, _ in exact.top_10}
+            rows.append({
+                "mode": name, "seconds": elapsed, "peak_mb": peak / (1 << 20),
+                "unique": rep.unique_words,
+                "unique_err_pct": 100 * abs(rep.unique_words - exact.unique_words) / exact.unique_words,
+                "top10_recall": len(true_top & {w for w, _ in rep.top_10}) / len(true_top),
+                "max_count_err": max(abs(c - dict(exact.top_10).get(w, c)) for w, c in rep.top_10),
+            })
+    return rows
+
+def bench() -> None:
+    for r in benchmark():
+        print(f"{r['mode']:<36} {r['seconds']:6.2f}s  peak {r['peak_mb']:7.1f} MB  "
+              f"unique {r['unique']:>8} ({r['unique_err_pct']:.2f}% err)  "
+              f"top10 recall {r['top10_recall']:.0%}  max count err {r['max_count_err']}")
+
+if __name__ == "__main__":
+    if "--bench" in sys.argv[1:]:
+        bench()
+    else:
+        for arg in sys.argv[1:]:
+            print(arg, analyze_approx(arg))
@@ -0,0 +1,204 @@
+# comprehensions/text_stream.py
+"""
+Analiza przyrostowa: dowolne źródła (katalogi, .gz, .bz2, stdin, rosnące logi),
+raport w każdej chwili, scalanie stanów i checkpointy do wznawiania.
+    python text_stream.py logs/ archive.txt.gz -          # katalog + archiwum + stdin
+    python text_stream.py --follow app.log --checkpoint app.ckpt
+"""
+from __future__ import annotations
+import argparse
+import bz2
+import codecs
+import gzip
+import json
+import os
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import BinaryIO, Iterator
+
+from text_analyzer import Report, _Partial, _merge, _report, _tally, format_report
+
+_OPENERS = {".gz": gzip.open, ".bz2": bz2.open}
+
+
+class TextAnalyzer:
+    """
+    Stan analizy karmiony kawałkami tekstu (str albo bajty UTF-8) o dowolnych granicach.
+    Niedokończona ostatnia linia czeka w _pending na kolejny kawałek;
+    report() traktuje ją jak ostatnią linię, ale jej nie "zjada".
+    offsets: ile bajtów każdego źródła już przetworzono (do wznawiania).
+    """
+    def __init__(self) -> None:
+        self._part = _Partial(Counter())
+        self._pending = ""
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self.offsets: dict[str, int] = {}
+
+    # --- karmienie ---
+
+    def feed(self, chunk: str | bytes) -> None:
+        if isinstance(chunk, bytes):
+            chunk = self._decoder.decode(chunk)
+        text = self._pending + chunk
+        # końce linii jak open(..., "r"): \r\n i \r -> \n; \r na końcu może być początkiem \r\n
+        cut = len(text) - 1 if text.endswith("\r") else len(text)
+        body = text[:cut].replace("\r\n", "\n").replace("\r", "\n")
+        nl = body.rfind("\n")
+        self._pending = body[nl + 1:] + text[cut:]
+        if nl >= 0:
+            _tally(self._part, body[:nl + 1], body.count("\n", 0, nl + 1))
+
+    def end_source(self) -> None:
+        """Koniec pliku = koniec linii; resetuje dekoder przed następnym źródłem."""
+        tail = self._decoder.decode(b"", final=True)
+        text = (self._pending + tail).replace("\r\n", "\n").replace("\r", "\n")
+        self._pending = ""
+        self._decoder.reset()
+        if text:
+            _tally(self._part, text, text.count("\n") + (not text.endswith("\n")))
+
+    def feed_stream(self, stream: BinaryIO, key: str | None = None, chunk_size: int = 1 << 20) -> None:
+        """Czyta strumień binarny do EOF; read1 -> nie czeka na pełny kawałek (stdin, potoki)."""
+        read = getattr(stream, "read1", stream.read)
+        while chunk := read(chunk_size):
+            self.feed(chunk)
+            if key is not None:
+                self.offsets[key] = self.offsets.get(key, 0) + len(chunk)
+
+    def feed_path(self, path: str | Path, *, final: bool = True, chunk_size: int = 1 << 20) -> None:
+        """
+        Plik (także .gz/.bz2) od zapamiętanego offsetu - już przeczytane bajty są pomijane.
+        Plik krótszy niż offset (rotacja logu) czytamy od nowa.
+        final=False (tail): niedokończona ostatnia linia czeka na dopisanie reszty.
+        """
+        path = Path(path)
+        key = str(path.resolve())
+        opener = _OPENERS.get(path.suffix, open)
+        start = self.offsets.get(key, 0)
+        if opener is open and start > path.stat().st_size:
+            start = self.offsets[key] = 0
+            self._pending = ""
+            self._decoder.reset()
+        with opener(path, "rb") as fh:
+            if start:
+                fh.seek(start)  # gzip/bz2: przewija dekompresją, ale bez ponownego liczenia
+            self.offsets[key] = start
+            self.feed_stream(fh, key, chunk_size)
+        if final:
+            self.end_source()
+
+    def feed_source(self, source: str | Path) -> None:
+        """'-' = stdin, katalog = wszystkie pliki rekurencyjnie, inaczej pojedynczy plik."""
+        if str(source) == "-":
+            self.feed_stream(sys.stdin.buffer)
+            self.end_source()
+            return
+        path = Path(source)
+        files = sorted(p for p in path.rglob("*") if p.is_file()) if path.is_dir() else [path]
+        for f in files:
+            self.feed_path(f)
+
+    # --- wyniki ---
+
+    def report(self) -> Report:
+        """Aktualny raport (z niedokończoną linią), bez zmiany stanu."""
+        if not self._pending:
+            return _report(self._part)
+        pend = _Partial(Counter())
+        _tally(pend, self._pending, 1)
+        counter = self._part.counter
+        counter.update(pend.counter)  # chwilowo, dla dokładnego top_10 / unique
+        try:
+            return _report(_Partial(counter, self._part.lines + 1, self._part.words + pend.words,
+                                    self._part.chars + pend.chars))
+        finally:
+            for w, c in pend.counter.items():
+                counter[w] -= c
+                if not counter[w]:
+                    del counter[w]
+
+    def merge(self, other: "TextAnalyzer") -> "TextAnalyzer":
+        """Dolicza stan innego analizatora (np. z innego pliku/procesu); jego ostatnia linia się kończy."""
+        self._part = _merge([self._part, other._part])
+        if other._pending:
+            _tally(self._part, other._pending, 1)
+        for key, off in other.offsets.items():
+            self.offsets[key] = max(off, self.offsets.get(key, 0))
+        return self
+
+    # --- checkpoint ---
+
+    def save(self, path: str | Path) -> None:
+        """Zapis stanu (atomowo: plik tymczasowy + os.replace)."""
+        buf, flag = self._decoder.getstate()
+        state = {
+            "version": 1,
+            "lines": self._part.lines, "words": self._part.words, "chars": self._part.chars,
+            "counter": list(self._part.counter.items()),  # lista par - zachowuje kolejność (remisy)
+            "pending": self._pending,
+            "decoder": [buf.hex(), flag],
+            "offsets": self.offsets,
+        }
+        path = Path(path)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(state, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "TextAnalyzer":
+        state = json.loads(Path(path).read_text(encoding="utf-8"))
+        if state.get("version") != 1:
+            raise ValueError(f"Unsupported checkpoint version: {state.get('version')!r}")
+        self = cls()
+        self._part = _Partial(Counter(dict(state["counter"])), state["lines"], state["words"], state["chars"])
+        self._pending = state["pending"]
+        buf, flag = state["decoder"]
+        self._decoder.setstate((bytes.fromhex(buf), flag))
+        self.offsets = state["offsets"]
+        return self
+
+    @classmethod
+    def resume(cls, checkpoint: str | Path) -> "TextAnalyzer":
+        """Stan z checkpointu albo nowy analizator, jeśli checkpointu jeszcze nie ma."""
+        return cls.load(checkpoint) if Path(checkpoint).exists() else cls()
+
+
+def follow(path: str | Path, analyzer: TextAnalyzer | None = None, *, interval: float = 1.0,
+           checkpoint: str | Path | None = None) -> Iterator[Report]:
+    """
+    `tail -f` z analizą: co `interval` s dolicza nowe bajty i zwraca raport.
+    Z checkpointem stan jest zapisywany po każdej rundzie - po restarcie czytamy od offsetu.
+    """
+    if analyzer is None:
+        analyzer = TextAnalyzer.resume(checkpoint) if checkpoint else TextAnalyzer()
+    while True:
+        analyzer.feed_path(path, final=False)
+        if checkpoint:
+            analyzer.save(checkpoint)
+        yield analyzer.report()
+        time.sleep(interval)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Incremental text analysis (dirs, .gz, .bz2, stdin)")
+    ap.add_argument("sources", nargs="*", help="files, directories or '-' for stdin")
+    ap.add_argument("--follow", metavar="FILE", help="tail a growing file and print reports")
+    ap.add_argument("--checkpoint", metavar="PATH", help="state file for resuming")
+    ap.add_argument("--interval", type=float, default=2.0)
+    args = ap.parse_args()
+
+    if args.follow:
+        for rep in follow(args.follow, interval=args.interval, checkpoint=args.checkpoint):
+            print(format_report(rep))
+        return
+    an = TextAnalyzer.resume(args.checkpoint) if args.checkpoint else TextAnalyzer()
+    for src in args.sources or ["-"]:
+        an.feed_source(src)
+    if args.checkpoint:
+        an.save(args.checkpoint)
+    print(format_report(an.report()))
+
+if __name__ == "__main__":
+    main()
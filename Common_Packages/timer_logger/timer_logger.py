@@ -1,17 +1,134 @@
 # context_manager/timer_logger.py
 from __future__ import annotations
+from contextvars import ContextVar
+from dataclasses import dataclass
+from itertools import count
+import inspect
+import json
+import os
 from pathlib import Path
-from time import perf_counter, sleep
+import sys
+import threading
+from time import perf_counter, perf_counter_ns, sleep
 from functools import wraps
 from typing import Callable
 
+@dataclass
+class Span:
+    name: str
+    span_id: int
+    parent_id: int | None
+    start_ns: int
+    duration_ns: int
+    track: tuple[int, int, str]  # (wątek, id zadania asyncio albo 0, nazwa ścieżki)
+
+class Tracer:
+    """
+    Bufor cykliczny zakończonych spanów: zapis to jedno przypisanie do listy
+    (najstarsze nadpisywane po `capacity`), eksport dopiero na żądanie.
+    """
+    def __init__(self, capacity: int = 65_536):
+        self.capacity = capacity
+        self._buf: list[tuple | None] = [None] * capacity
+        self._n = count()   # next() atomowe pod GIL - bez blokady
+        self._written = 0
+
+    def record(self, rec: tuple) -> None:
+        i = next(self._n)
+        self._buf[i % self.capacity] = rec
+        self._written = i + 1
+
+    def spans(self) -> list[Span]:
+        """Zakończone spany od najstarszego."""
+        n = self._written
+        if n <= self.capacity:
+            recs = self._buf[:n]
+        else:
+            i = n % self.capacity
+            recs = self._buf[i:] + self._buf[:i]
+        return [Span(*r) for r in recs if r is not None]
+
+    def chrome_trace(self) -> dict:
+        """Format Chrome Trace Event (chrome://tracing, ui.perfetto.dev): zdarzenia "X" + nazwy ścieżek."""
+        pid = os.getpid()
+        tids: dict[tuple[int, int], int] = {}
+        events = []
+        for sp in self.spans():
+            thread, task, label = sp.track
+            tid = tids.get((thread, task))
+            if tid is None:
+                # każde zadanie asyncio na osobnej ścieżce - inaczej nakładające się spany psują zagnieżdżenie
+                tid = tids[(thread, task)] = len(tids) + 1
+                events.append({"ph": "M", "name": "thread_name", "pid": pid, "tid": tid, "args": {"name": label}})
+            events.append({
+                "ph": "X", "name": sp.name, "pid": pid, "tid": tid,
+                "ts": sp.start_ns / 1e3, "dur": sp.duration_ns / 1e3,
+                "args": {"span_id": sp.span_id, "parent_id": sp.parent_id},
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export(self, path: str | Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.chrome_trace()), encoding="utf-8")
+        return path
+
+_tracer: Tracer | None = None
+_current_span: ContextVar[int | None] = ContextVar("current_span", default=None)  # per wątek i per zadanie
+_span_ids = count(1)
+
+def enable_tracing(capacity: int = 65_536) -> Tracer:
+    """Od teraz Timer(nazwa) i @timeit zapisują spany (zamiast print w timeit)."""
+    global _tracer
+    _tracer = Tracer(capacity)
+    return _tracer
+
+def disable_tracing() -> Tracer | None:
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
+
+def export_chrome_trace(path: str | Path = "trace.json") -> Path:
+    if _tracer is None:
+        raise RuntimeError("Tracing is not enabled (call enable_tracing() first)")
+    return _tracer.export(path)
+
+def _track() -> tuple[int, int, str]:
+    thread = threading.get_ident()
+    aio = sys.modules.get("asyncio")  # asyncio tylko, jeśli program go używa
+    if aio is not None:
+        try:
+            task = aio.current_task()
+        except RuntimeError:
+            task = None
+        if task is not None:
+            return thread, id(task), task.get_name()
+    return thread, 0, threading.current_thread().name
+
 class Timer:
-    """CM mierzący czas bloku; wynik w atrybucie .elapsed."""
+    """
+    CM mierzący czas bloku; wynik w atrybucie .elapsed.
+    Z włączonym śledzeniem (enable_tracing) zapisuje span `name`, zagnieżdżony w bieżącym.
+    """
+    def __init__(self, name: str = "block"):
+        self.name = name
     def __enter__(self):
+        if _tracer is not None:
+            self._id = next(_span_ids)
+            self._parent = _current_span.get()
+            self._token = _current_span.set(self._id)
         self._t0 = perf_counter()
+        self._t0_ns = perf_counter_ns()
         return self
     def __exit__(self, exc_type, exc, tb):
+        end_ns = perf_counter_ns()
         self.elapsed = perf_counter() - self._t0
+        token = self.__dict__.pop("_token", None)
+        if token is not None:
+            _current_span.reset(token)
+            tracer = _tracer  # mogło zostać wyłączone w trakcie bloku
+            if tracer is not None:
+                tracer.record((self.name, self._id, self._parent, self._t0_ns, end_ns - self._t0_ns, _track()))
         return False  # nie tłumimy wyjątków
 
 class LogFile:
@@ -32,12 +149,24 @@ class LogFile:
         return False
 
 def timeit(fn: Callable) -> Callable:
-    """Dekorator używający Timer pod spodem."""
+    """Dekorator używający Timer pod spodem; przy włączonym śledzeniu span zamiast print. Obsługuje async def."""
+    name = fn.__qualname__
+    if inspect.iscoroutinefunction(fn):
+        @wraps(fn)
+        async def async_wrapper(*args, **kwargs):
+            with Timer(name) as t:
+                result = await fn(*args, **kwargs)
+            if _tracer is None:
+                print(f"{fn.__name__} took {t.elapsed:.4f}s")
+            return result
+        return async_wrapper
+
     @wraps(fn)
     def wrapper(*args, **kwargs):
-        with Timer() as t:
+        with Timer(name) as t:
             result = fn(*args, **kwargs)
-        print(f"{fn.__name__} took {t.elapsed:.4f}s")
+        if _tracer is None:
+            print(f"{fn.__name__} took {t.elapsed:.4f}s")
         return result
     return wrapper
 
@@ -59,5 +188,29 @@ def demo():
         log.write(f"Result = {val}\n")
     print(f"Block took {t.elapsed:.4f}s; logs → {Path('logs.txt').resolve()}")
 
+def demo_trace(path: str | Path = "trace.json"):
+    """Spany z wątków i zadań asyncio -> plik do otwarcia w ui.perfetto.dev."""
+    import asyncio
+
+    @timeit
+    async def fetch(i: int) -> int:
+        with Timer(f"parse {i}"):
+            await asyncio.sleep(0.01 * i)
+        return i
+
+    @timeit
+    async def handle_request() -> int:
+        return sum(await asyncio.gather(*(fetch(i) for i in range(1, 4))))
+
+    enable_tracing()
+    with Timer("main"):
+        worker = threading.Thread(target=slow_sum, args=(20_000,), name="worker")
+        worker.start()
+        asyncio.run(handle_request())
+        worker.join()
+    out = export_chrome_trace(path)
+    disable_tracing()
+    print(f"Trace → {out.resolve()} (chrome://tracing / ui.perfetto.dev)")
+
 if __name__ == "__main__":
-    demo()
+    demo_trace() if "--trace" in sys.argv[1:] else demo()
@@ -0,0 +1,320 @@
+from __future__ import annotations
+import itertools
+import random
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Protocol, runtime_checkable
+
+from lru_cache import LRUCache
+
+_MISSING = object()
+
+
+@runtime_checkable
+class CachePolicy(Protocol):
+    """Wspólny interfejs cache'y o stałej pojemności (LRUCache też go spełnia)."""
+    cap: int
+    def get(self, k: Any, default: Any = None) -> Any: ...
+    def put(self, k: Any, v: Any) -> None: ...
+    def __len__(self) -> int: ...
+    def __contains__(self, k: Any) -> bool: ...
+
+
+class LFUCache:
+    """
+    LFU w O(1): kubełki częstości (freq -> OrderedDict kluczy).
+    Wyrzucamy najrzadziej używany; przy remisie - najdawniej użyty w kubełku.
+    """
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.cap = capacity
+        self.vals: Dict[Any, Any] = {}
+        self.freq: Dict[Any, int] = {}
+        self.buckets: Dict[int, OrderedDict] = {}
+        self.min_freq = 0
+
+    def _touch(self, k: Any) -> None:
+        f = self.freq[k]
+        bucket = self.buckets[f]
+        del bucket[k]
+        if not bucket:
+            del self.buckets[f]
+            if self.min_freq == f:
+                self.min_freq = f + 1
+        self.freq[k] = f + 1
+        self.buckets.setdefault(f + 1, OrderedDict())[k] = None
+
+    def get(self, k: Any, default: Any = None) -> Any:
+        if k not in self.vals:
+            return default
+        self._touch(k)
+        return self.vals[k]
+
+    def put(self, k: Any, v: Any) -> None:
+        if k in self.vals:
+            self.vals[k] = v
+            self._touch(k)
+            return
+        if len(self.vals) >= self.cap:
+            bucket = self.buckets[self.min_freq]
+            old, _ = bucket.popitem(last=False)
+            if not bucket:
+                del self.buckets[self.min_freq]
+            del self.vals[old], self.freq[old]
+        self.vals[k] = v
+        self.freq[k] = 1
+        self.buckets.setdefault(1, OrderedDict())[k] = None
+        self.min_freq = 1
+
+    def __len__(self) -> int:
+        return len(self.vals)
+
+    def __contains__(self, k: Any) -> bool:
+        return k in self.vals
+
+
+class ARCCache:
+    """
+    Adaptive Replacement Cache (Megiddo & Modha).
+    T1 - widziane raz, T2 - widziane wielokrotnie, B1/B2 - "duchy" (same klucze)
+    wyrzuconych wpisów. Trafienia w duchach przesuwają cel p = docelowy rozmiar T1,
+    więc cache sam dobiera proporcję recency/frequency; skan nie wypłukuje T2.
+    """
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.cap = capacity
+        self.p = 0
+        self.t1: OrderedDict = OrderedDict()
+        self.t2: OrderedDict = OrderedDict()
+        self.b1: OrderedDict = OrderedDict()
+        self.b2: OrderedDict = OrderedDict()
+
+    def _replace(self, in_b2: bool) -> None:
+        if self.t1 and (len(self.t1) > self.p or (in_b2 and len(self.t1) == self.p)):
+            old, _ = self.t1.popitem(last=False)
+            self.b1[old] = None
+        else:
+            old, _ = self.t2.popitem(last=False)
+            self.b2[old] = None
+
+    def get(self, k: Any, default: Any = None) -> Any:
+        if k in self.t1:
+            v = self.t1.pop(k)
+            self.t2[k] = v
+            return v
+        if k in self.t2:
+            self.t2.move_to_end(k)
+            return self.t2[k]
+        return default
+
+    def put(self, k: Any, v: Any) -> None:
+        if k in self.t1:
+            del self.t1[k]
+            self.t2[k] = v
+            return
+        if k in self.t2:
+            self.t2[k] = v
+            self.t2.move_to_end(k)
+            return
+        if k in self.b1:
+            self.p = min(self.cap, self.p + max(len(self.b2) // len(self.b1), 1))
+            self._replace(in_b2=False)
+            del self.b1[k]
+            self.t2[k] = v
+            return
+        if k in self.b2:
+            self.p = max(0, self.p - max(len(self.b1) // len(self.b2), 1))
+            self._replace(in_b2=True)
+            del self.b2[k]
+            self.t2[k] = v
+            return
+        l1 = len(self.t1) + len(self.b1)
+        total = l1 + len(self.t2) + len(self.b2)
+        if l1 == self.cap:
+            if len(self.t1) < self.cap:
+                self.b1.popitem(last=False)
+                self._replace(in_b2=False)
+            else:
+                self.t1.popitem(last=False)
+        elif total >= self.cap:
+            if total == 2 * self.cap:
+                self.b2.popitem(last=False)
+            self._replace(in_b2=False)
+        self.t1[k] = v
+
+    def __len__(self) -> int:
+        return len(self.t1) + len(self.t2)
+
+    def __contains__(self, k: Any) -> bool:
+        return k in self.t1 or k in self.t2
+
+
+class CountMinSketch:
+    """
+    Count-min sketch z 4-bitowymi licznikami (max 15) i "starzeniem":
+    po `sample` dodaniach wszystkie liczniki są dzielone przez 2,
+    więc dawna popularność z czasem wygasa.
+    """
+    _SEEDS = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0xD6E8FEB86659FD93)
+    _HALVE = bytes(i >> 1 for i in range(256))  # tablica dla bytearray.translate
+
+    def __init__(self, width: int, sample: int | None = None):
+        self.width = 1 << max(4, (width - 1).bit_length())  # potęga 2 -> maska zamiast %
+        self._mask = self.width - 1
+        self.tables: List[bytearray] = [bytearray(self.width) for _ in self._SEEDS]
+        self.sample = sample or 10 * self.width
+        self.additions = 0
+
+    def add(self, k: Any) -> None:
+        h = hash(k) & 0xFFFFFFFFFFFFFFFF
+        mask = self._mask
+        for table, s in zip(self.tables, self._SEEDS):
+            i = ((h * s) >> 32) & mask
+            if table[i] < 15:
+                table[i] += 1
+        self.additions += 1
+        if self.additions >= self.sample:
+            self._reset()
+
+    def estimate(self, k: Any) -> int:
+        h = hash(k) & 0xFFFFFFFFFFFFFFFF
+        mask = self._mask
+        return min(table[((h * s) >> 32) & mask] for table, s in zip(self.tables, self._SEEDS))
+
+    def _reset(self) -> None:
+        self.additions //= 2
+        for table in self.tables:
+            table[:] = table.translate(self._HALVE)
+
+
+class WTinyLFUCache:
+    """
+    W-TinyLFU (jak w Caffeine):
+        - okno LRU (~1% pojemności) przyjmuje nowe wpisy,
+        - główna część SLRU: probation (20%) + protected (80%),
+        - kandydat wypadający z okna wchodzi do części głównej tylko wtedy,
+          gdy sketch szacuje go jako częstszego niż ofiara z probation.
+    Częstość liczona przy każdym get (trafienie i chybienie).
+    """
+    def __init__(self, capacity: int, window_pct: float = 0.01):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.cap = capacity
+        self.window_cap = max(1, int(capacity * window_pct))
+        self.main_cap = capacity - self.window_cap
+        self.protected_cap = int(self.main_cap * 0.8)
+        self.window: OrderedDict = OrderedDict()
+        self.probation: OrderedDict = OrderedDict()
+        self.protected: OrderedDict = OrderedDict()
+        self.sketch = CountMinSketch(capacity)
+
+    def get(self, k: Any, default: Any = None) -> Any:
+        self.sketch.add(k)
+        if k in self.window:
+            self.window.move_to_end(k)
+            return self.window[k]
+        if k in self.protected:
+            self.protected.move_to_end(k)
+            return self.protected[k]
+        if k in self.probation:
+            v = self.probation.pop(k)
+            self.protected[k] = v
+            if len(self.protected) > self.protected_cap:
+                old, ov = self.protected.popitem(last=False)
+                self.probation[old] = ov
+            return v
+        return default
+
+    def put(self, k: Any, v: Any) -> None:
+        for seg in (self.window, self.protected, self.probation):
+            if k in seg:
+                seg[k] = v
+                seg.move_to_end(k)
+                return
+        self.window[k] = v
+        if len(self.window) > self.window_cap:
+            self._admit(*self.window.popitem(last=False))
+
+    def _admit(self, cand: Any, cv: Any) -> None:
+        if self.main_cap == 0:
+            return
+        if len(self.probation) + len(self.protected) < self.main_cap:
+            self.probation[cand] = cv
+            return
+        seg = self.probation if self.probation else self.protected
+        victim = next(iter(seg))
+        if self.sketch.estimate(cand) > self.sketch.estimate(victim):
+            del seg[victim]
+            self.probation[cand] = cv
+
+    def __len__(self) -> int:
+        return len(self.window) + len(self.probation) + len(self.protected)
+
+    def __contains__(self, k: Any) -> bool:
+        return k in self.window or k in self.probation or k in self.protected
+
+
+POLICIES: Dict[str, Callable[[int], CachePolicy]] = {
+    "lru": LRUCache,
+    "lfu": LFUCache,
+    "arc": ARCCache,
+    "w-tinylfu": WTinyLFUCache,
+}
+
+# --- syntetyczne trace'y ---
+
+def zipf_trace(length: int, n_keys: int, alpha: float = 0.99, seed: int = 42) -> List[int]:
+    rng = random.Random(seed)
+    cum = list(itertools.accumulate(1.0 / (i ** alpha) for i in range(1, n_keys + 1)))
+    return rng.choices(range(n_keys), cum_weights=cum, k=length)
+
+def scan_trace(length: int, n_keys: int, scan_len: int, seed: int = 42) -> List[int]:
+    """Gorący zbiór (Zipf) przerywany długimi skanami jednorazowych kluczy."""
+    hot = zipf_trace(length, n_keys, seed=seed)
+    out: List[int] = []
+    fresh = n_keys
+    for i in range(0, length, scan_len):
+        out.extend(hot[i:i + scan_len])
+        out.extend(range(fresh, fresh + scan_len))
+        fresh += scan_len
+    return out[:length]
+
+def loop_trace(length: int, loop_len: int) -> List[int]:
+    """Cykliczny obieg po loop_len kluczach - dla LRU przy loop_len > cap 0% trafień."""
+    return [i % loop_len for i in range(length)]
+
+def replay(cache: CachePolicy, trace: List[int]) -> tuple[float, float]:
+    """Odtwarza trace (get, przy chybieniu put). Zwraca (hit_ratio, ops/s)."""
+    hits = 0
+    get, put = cache.get, cache.put
+    start = time.perf_counter()
+    for k in trace:
+        if get(k, _MISSING) is _MISSING:
+            put(k, k)
+        else:
+            hits += 1
+    dur = time.perf_counter() - start
+    return hits / len(trace), len(trace) / dur
+
+def benchmark(capacity: int = 1_000, length: int = 200_000) -> dict[str, dict[str, tuple[float, float]]]:
+    traces = {
+        "zipf": zipf_trace(length, n_keys=capacity * 20),
+        "scan": scan_trace(length, n_keys=capacity * 5, scan_len=capacity * 2),
+        "loop": loop_trace(length, loop_len=int(capacity * 1.5)),
+    }
+    return {
+        name: {policy: replay(factory(capacity), trace) for policy, factory in POLICIES.items()}
+        for name, trace in traces.items()
+    }
+
+
+def demo() -> None:
+    for trace, results in benchmark().items():
+        print(f"\n{trace}")
+        for policy, (ratio, ops) in sorted(results.items(), key=lambda x: -x[1][0]):
+            print(f"{policy:<10} hit={ratio:6.2%} {ops:>12,.0f} ops/s")
+
+if __name__ == "__main__":
+    demo()
@@ -0,0 +1,185 @@
+from __future__ import annotations
+import gc
+import time
+from typing import Any, Dict, Iterable, List, Tuple
+
+from lru_cache import LRUCache
+
+
+class ArenaLRUCache:
+    """
+    LRU na prealokowanych tablicach równoległych - bez obiektu _Node na wpis.
+        - slot i: _keys[i], _vals[i], _prev[i], _next[i] (listy intów - GC ich nie śledzi;
+          array('q') byłby mniejszy, ale każdy odczyt tworzy nowy int -> ~2x wolniej),
+        - slot o indeksie `cap` to wartownik: _next[cap] = najnowszy, _prev[cap] = najstarszy,
+        - _free: stos wolnych slotów (po pop()/clear()).
+    Mniej obiektów śledzonych przez GC -> krótsze pauzy przy milionach wpisów.
+    get_many/put_many robią całą paczkę w jednej pętli na lokalnych zmiennych.
+    """
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.cap = capacity
+        self._keys: List[Any] = [None] * capacity
+        self._vals: List[Any] = [None] * capacity
+        self._prev: List[int] = [capacity] * (capacity + 1)
+        self._next: List[int] = [capacity] * (capacity + 1)
+        self._index: Dict[Any, int] = {}
+        self._free: List[int] = list(range(capacity - 1, -1, -1))
+
+    def _unlink(self, i: int) -> None:
+        p, n = self._prev[i], self._next[i]
+        self._next[p] = n
+        self._prev[n] = p
+
+    def _push_front(self, i: int) -> None:
+        h = self.cap
+        f = self._next[h]
+        self._next[i] = f
+        self._prev[i] = h
+        self._prev[f] = i
+        self._next[h] = i
+
+    def _slot_for_new(self) -> int:
+        """Wolny slot albo slot najstarszego wpisu (eviction)."""
+        if self._free:
+            return self._free.pop()
+        i = self._prev[self.cap]
+        self._unlink(i)
+        del self._index[self._keys[i]]
+        return i
+
+    def get(self, k: Any, default: Any = None) -> Any:
+        i = self._index.get(k)
+        if i is None:
+            return default
+        if self._next[self.cap] != i:
+            self._unlink(i)
+            self._push_front(i)
+        return self._vals[i]
+
+    def put(self, k: Any, v: Any) -> None:
+        i = self._index.get(k)
+        if i is not None:
+            self._vals[i] = v
+            self._unlink(i)
+        else:
+            i = self._slot_for_new()
+            self._keys[i] = k
+            self._vals[i] = v
+            self._index[k] = i
+        self._push_front(i)
+
+    def pop(self, k: Any, default: Any = None) -> Any:
+        i = self._index.pop(k, None)
+        if i is None:
+            return default
+        self._unlink(i)
+        v = self._vals[i]
+        self._keys[i] = self._vals[i] = None  # nie trzymamy referencji
+        self._free.append(i)
+        return v
+
+    def get_many(self, keys: Iterable[Any], default: Any = None) -> List[Any]:
+        index, vals, prev, nxt, h = self._index, self._vals, self._prev, self._next, self.cap
+        out: List[Any] = []
+        append = out.append
+        for k in keys:
+            i = index.get(k)
+            if i is None:
+                append(default)
+                continue
+            f = nxt[h]
+            if f != i:
+                p, n = prev[i], nxt[i]
+                nxt[p] = n; prev[n] = p
+                nxt[i] = f; prev[i] = h; prev[f] = i; nxt[h] = i
+            append(vals[i])
+        return out
+
+    def put_many(self, items: Iterable[Tuple[Any, Any]]) -> None:
+        index, keys, vals, prev, nxt, free, h = (
+            self._index, self._keys, self._vals, self._prev, self._next, self._free, self.cap)
+        for k, v in items:
+            i = index.get(k)
+            if i is not None:
+                vals[i] = v
+                if nxt[h] == i:
+                    continue
+                p, n = prev[i], nxt[i]
+                nxt[p] = n; prev[n] = p
+            else:
+                if free:
+                    i = free.pop()
+                else:
+                    i = prev[h]
+                    p = prev[i]
+                    nxt[p] = h; prev[h] = p
+                    del index[keys[i]]
+                keys[i] = k
+                vals[i] = v
+                index[k] = i
+            f = nxt[h]
+            nxt[i] = f; prev[i] = h; prev[f] = i; nxt[h] = i
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, k: Any) -> bool:
+        return k in self._index
+
+    def clear(self) -> None:
+        self.__init__(self.cap)
+
+
+# --- benchmark ---
+
+def benchmark(n: int = 500_000) -> dict[str, dict[str, float]]:
+    """
+    Wypełnia cache n wpisami i mierzy: ns/op dla put, get, put_many, get_many
+    oraz czas pełnego gc.collect() z zapełnionym cache.
+    """
+    keys = list(range(n))
+    items = [(k, k) for k in keys]
+    results: dict[str, dict[str, float]] = {}
+    for name, factory in (("LRUCache", LRUCache), ("ArenaLRUCache", ArenaLRUCache)):
+        r: dict[str, float] = {}
+        c = factory(n)
+        t0 = time.perf_counter()
+        for k, v in items:
+            c.put(k, v)
+        r["put ns/op"] = (time.perf_counter() - t0) / n * 1e9
+        t0 = time.perf_counter()
+        for k in keys:
+            c.get(k)
+        r["get ns/op"] = (time.perf_counter() - t0) / n * 1e9
+        if isinstance(c, ArenaLRUCache):
+            t0 = time.perf_counter()
+            c.put_many(items)
+            r["put_many ns/op"] = (time.perf_counter() - t0) / n * 1e9
+            t0 = time.perf_counter()
+            c.get_many(keys)
+            r["get_many ns/op"] = (time.perf_counter() - t0) / n * 1e9
+        t0 = time.perf_counter()
+        gc.collect()
+        r["gc.collect ms"] = (time.perf_counter() - t0) * 1e3
+        results[name] = r
+        del c
+        gc.collect()
+    return results
+
+
+def demo() -> None:
+    c = ArenaLRUCache(2)
+    c.put_many([("a", 1), ("b", 2)])
+    print(c.get_many(["a", "x"]))
+    c.put("c", 3)
+    print("b" in c, c.get("a"))
+
+    for name, r in benchmark().items():
+        print(f"\n{name}")
+        for metric, val in r.items():
+            print(f"  {metric:<15} {val:10.1f}")
+
+if __name__ == "__main__":
+    demo()
@@ -1,13 +1,29 @@
 from __future__ import annotations
-from typing import Any, Dict, Optional
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
 
 class _Node:
-    __slots__ = ("k", "v", "prev", "next")
-    def __init__(self, k: Any, v: Any):
+    __slots__ = ("k", "v", "prev", "next", "exp", "w")
+    def __init__(self, k: Any, v: Any, exp: Optional[float] = None, w: int = 1):
         self.k = k; self.v = v
+        self.exp = exp  # czas wygaśnięcia (clock()) lub None = bez TTL
+        self.w = w      # koszt/waga wpisu, np. rozmiar w bajtach
         self.prev: Optional[_Node] = None
         self.next: Optional[_Node] = None
 
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
 class LRUCache:
     """
     LRU Cache implementation.
@@ -15,11 +31,39 @@ class LRUCache:
         - hash map: klucz -> węzeł,
         - podwójnie wiązana lista: kolejność użycia (head <-> ... <-> tail)
     Najnowszy element -> head, najstarszy element -> tail
+
+    Opcjonalnie:
+        - ttl: domyślny czas życia wpisu w sekundach (można nadpisać w put),
+          wygasanie leniwe (przy get) + okresowe (sweep co sweep_interval s),
+        - max_weight: budżet łącznej wagi wpisów; waga z put(weight=...)
+          albo z funkcji weigher(k, v), domyślnie 1,
+        - stats: liczniki trafień, chybień, eviction i wygaśnięć,
+        - on_evict(k, v): wywoływane dla wpisów wyrzuconych z ogona
+          (nie dla wygasłych), np. żeby przenieść je do wolniejszej warstwy.
     """
-    def __init__(self, capacity: int):
+    def __init__(self, capacity: int, *, ttl: Optional[float] = None,
+                 max_weight: Optional[int] = None,
+                 weigher: Optional[Callable[[Any, Any], int]] = None,
+                 sweep_interval: float = 60.0,
+                 on_evict: Optional[Callable[[Any, Any], None]] = None,
+                 clock: Callable[[], float] = time.monotonic):
         if capacity <= 0:
             raise ValueError("capacity must be positive")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be positive")
+        if max_weight is not None and max_weight <= 0:
+            raise ValueError("max_weight must be positive")
         self.cap = capacity
+        self.ttl = ttl
+        self.max_weight = max_weight
+        self.weigher = weigher
+        self.sweep_interval = sweep_interval
+        self.on_evict = on_evict
+        self.clock = clock
+        self.weight = 0
+        self.stats = CacheStats()
+        self._last_sweep = clock()
+        self._has_ttl = ttl is not None  # bez TTL sweep nie ma sensu
         self.map: Dict[Any, _Node] = {}
         self.head = _Node(None, None)
         self.tail = _Node(None, None)
@@ -41,39 +85,96 @@ class LRUCache:
         self._remove(n)
         self._add_front(n)
 
-    def get(self, k: Any) -> Any:
+    def _unlink(self, n: _Node) -> None:
+        self._remove(n)
+        del self.map[n.k]
+        self.weight -= n.w
+
+    def _expired(self, n: _Node, now: float) -> bool:
+        return n.exp is not None and n.exp <= now
+
+    def get(self, k: Any, default: Any = None) -> Any:
+        """Zwraca wartość albo `default` - pozwala odróżnić zapisane None od braku."""
         n = self.map.get(k)
-        if not n:
-            return None
+        if n is None:
+            self.stats.misses += 1
+            return default
+        if n.exp is not None and self._expired(n, self.clock()):
+            self._unlink(n)
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return default
         self._move_to_front(n)
+        self.stats.hits += 1
         return n.v
 
-    def put(self, k: Any, v: Any) -> None:
+    def put(self, k: Any, v: Any, *, ttl: Optional[float] = None,
+            weight: Optional[int] = None) -> None:
+        now = self.clock()
+        if self._has_ttl and now - self._last_sweep >= self.sweep_interval:
+            self._expire(now)  # nie expire(): podklasy z zamkiem już go trzymają w put()
+        ttl = self.ttl if ttl is None else ttl
+        exp = None
+        if ttl is not None:
+            exp = now + ttl
+            self._has_ttl = True
+        if weight is None:
+            weight = self.weigher(k, v) if self.weigher else 1
+        if weight < 0:
+            raise ValueError("weight must be non-negative")
+        if self.max_weight is not None and weight > self.max_weight:
+            raise ValueError(f"entry weight {weight} exceeds max_weight {self.max_weight}")
         n = self.map.get(k)
         if n:
-            n.v = v
+            n.v = v; n.exp = exp
+            self.weight += weight - n.w
+            n.w = weight
             self._move_to_front(n)
-            return
-        if len(self.map) == self.cap:
+        else:
+            n = _Node(k, v, exp, weight)
+            self.map[k] = n
+            self._add_front(n)
+            self.weight += weight
+        self._evict(keep=n)
+
+    def _evict(self, keep: _Node) -> None:
+        """Usuwa z ogona, dopóki przekroczony jest limit wpisów lub wagi."""
+        while len(self.map) > self.cap or (
+                self.max_weight is not None and self.weight > self.max_weight):
             lru = self.tail.prev
-            self._remove(lru)
-            self.map.pop(lru.k, None)
-        n = _Node(k, v)
-        self.map[k] = n
-        self._add_front(n)
+            if lru is keep:
+                break
+            self._unlink(lru)
+            self.stats.evictions += 1
+            if self.on_evict is not None:
+                self.on_evict(lru.k, lru.v)
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """Okresowe czyszczenie: usuwa wszystkie wygasłe wpisy (O(n)). Zwraca ich liczbę."""
+        return self._expire(now)
+
+    def _expire(self, now: Optional[float] = None) -> int:
+        now = self.clock() if now is None else now
+        self._last_sweep = now
+        dead = [n for n in self.map.values() if self._expired(n, now)]
+        for n in dead:
+            self._unlink(n)
+        self.stats.expirations += len(dead)
+        return len(dead)
 
     def __len__(self) -> int:
         return len(self.map)
 
     def __contains__(self, k: Any) -> bool:
-        return k in self.map
+        n = self.map.get(k)
+        return n is not None and not self._expired(n, self.clock())
 
     def clear(self) -> None:
         self.map.clear()
+        self.weight = 0
         self.head.next = self.tail
         self.tail.prev = self.head
 
-
 def demo():
     c = LRUCache(2)
     c.put("a", 1)
@@ -83,5 +184,15 @@ def demo():
     print("b" in c)
     print(c.get("a"))
 
+    # TTL + waga + statystyki (sztuczny zegar, żeby nie czekać)
+    now = [0.0]
+    c = LRUCache(100, ttl=10, max_weight=10, weigher=lambda k, v: len(v), clock=lambda: now[0])
+    c.put("x", "aaaa"); c.put("y", "bbbb"); c.put("z", "cccc")  # 12 > 10 -> eviction "x"
+    c.put("none", None, ttl=60, weight=0)
+    print("x:", c.get("x", "<miss>"), "| weight:", c.weight)
+    now[0] = 11
+    print("y po 11s:", c.get("y", "<expired>"), "| none:", c.get("none", "<miss>"))
+    print(c.stats, f"hit_ratio={c.stats.hit_ratio:.2f}")
+
 if __name__ == "__main__":
     demo()
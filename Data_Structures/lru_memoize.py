@@ -0,0 +1,203 @@
+from __future__ import annotations
+import asyncio
+import inspect
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from functools import wraps
+from typing import Any, Callable, Dict, Optional
+
+from lru_cache import CacheStats, LRUCache
+
+_MISSING = object()
+_KWD_MARK = object()  # separator args | kwargs w kluczu
+_FAST_TYPES = {int, str}
+
+
+@dataclass
+class MemoInfo:
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    coalesced: int  # wywołania, które poczekały na cudze obliczenie zamiast liczyć same
+    currsize: int
+    capacity: int
+
+
+def _make_key(args: tuple, kwargs: dict, typed: bool) -> Any:
+    """Klucz z args/kwargs; kolejność kwargs nie ma znaczenia."""
+    key = args
+    if kwargs:
+        key += (_KWD_MARK,) + tuple(sorted(kwargs.items()))
+    if typed:
+        key += tuple(type(v) for v in args)
+        if kwargs:
+            key += tuple(type(v) for _, v in sorted(kwargs.items()))
+    elif len(key) == 1 and type(key[0]) in _FAST_TYPES:
+        return key[0]
+    return key
+
+
+def lru_memoize(capacity: int = 128, ttl: Optional[float] = None, *,
+                typed: bool = False) -> Callable[[Callable], Callable]:
+    """
+    Dekorator memoizacji na LRUCache (funkcje zwykłe i async def).
+    Single-flight: przy braku klucza liczy tylko pierwszy wywołujący,
+    pozostali czekają na jego wynik (albo wyjątek - wyjątki nie są cache'owane).
+    Dla async def single-flight działa w obrębie jednej pętli zdarzeń;
+    rekurencyjne wywołanie z tym samym kluczem liczy wartość samo.
+    Czekający są liczeni w `coalesced`, nie w `misses`.
+    Statystyki: fn.cache_info(), czyszczenie: fn.cache_clear().
+    """
+    def decorator(fn: Callable) -> Callable:
+        cache = LRUCache(capacity, ttl=ttl)
+        lock = threading.Lock()  # chroni cache i inflight (get w LRU też modyfikuje)
+        # klucz w locie -> (future, właściciel: wątek albo zadanie asyncio liczące wartość)
+        inflight: Dict[Any, tuple[Any, Any]] = {}
+        coalesced = 0
+
+        def _lookup(key: Any, flight_key: Any, owner: Any,
+                    new_future: Callable[[], Any]) -> tuple[Any, Any, bool]:
+            """
+            Zwraca (wartość | _MISSING, future, czy_lider).
+            future None i brak wartości -> licz sam bez single-flight (wywołanie
+            rekurencyjne właściciela - czekanie na własny wynik to zakleszczenie).
+            """
+            nonlocal coalesced
+            with lock:
+                v = cache.get(key, _MISSING)
+                if v is not _MISSING:
+                    return v, None, False
+                entry = inflight.get(flight_key)
+                if entry is not None:
+                    fut, fut_owner = entry
+                    if fut_owner == owner:
+                        return _MISSING, None, False
+                    cache.stats.misses -= 1  # czekający liczony tylko jako coalesced
+                    coalesced += 1
+                    return _MISSING, fut, False
+                fut = new_future()
+                inflight[flight_key] = (fut, owner)
+                return _MISSING, fut, True
+
+        def _store(key: Any, value: Any) -> None:
+            with lock:
+                cache.put(key, value)
+
+        def _finish(flight_key: Any, key: Any, value: Any = _MISSING) -> None:
+            with lock:
+                if value is not _MISSING:
+                    cache.put(key, value)
+                inflight.pop(flight_key, None)
+
+        if inspect.iscoroutinefunction(fn):
+            @wraps(fn)
+            async def wrapper(*args, **kwargs):
+                key = _make_key(args, kwargs, typed)
+                while True:
+                    loop = asyncio.get_running_loop()
+                    # future należy do jednej pętli - inne pętle mają własne "w locie"
+                    flight_key = (loop, key)
+                    v, fut, leader = _lookup(key, flight_key, asyncio.current_task(), loop.create_future)
+                    if v is not _MISSING:
+                        return v
+                    if fut is None:
+                        result = await fn(*args, **kwargs)
+                        _store(key, result)
+                        return result
+                    if leader:
+                        break
+                    try:
+                        return await asyncio.shield(fut)
+                    except asyncio.CancelledError:
+                        if fut.cancelled():
+                            continue  # lider został anulowany - spróbuj policzyć samemu
+                        raise
+                try:
+                    result = await fn(*args, **kwargs)
+                except asyncio.CancelledError:
+                    _finish(flight_key, key)
+                    fut.cancel()
+                    raise
+                except BaseException as e:
+                    _finish(flight_key, key)
+                    fut.set_exception(e)
+                    fut.exception()  # oznacz jako odczytany - bez ostrzeżeń asyncio
+                    raise
+                _finish(flight_key, key, result)
+                fut.set_result(result)
+                return result
+        else:
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                key = _make_key(args, kwargs, typed)
+                v, fut, leader = _lookup(key, key, threading.get_ident(), Future)
+                if v is not _MISSING:
+                    return v
+                if fut is None:
+                    result = fn(*args, **kwargs)
+                    _store(key, result)
+                    return result
+                if not leader:
+                    return fut.result()
+                try:
+                    result = fn(*args, **kwargs)
+                except BaseException as e:
+                    _finish(key, key)
+                    fut.set_exception(e)
+                    raise
+                _finish(key, key, result)
+                fut.set_result(result)
+                return result
+
+        def cache_info() -> MemoInfo:
+            with lock:
+                s = cache.stats
+                return MemoInfo(s.hits, s.misses, s.evictions, s.expirations,
+                                coalesced, len(cache), cache.cap)
+
+        def cache_clear() -> None:
+            nonlocal coalesced
+            with lock:
+                cache.clear()
+                cache.stats = CacheStats()
+                coalesced = 0
+
+        wrapper.cache_info = cache_info
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorator
+
+
+# --- DEMO ---
+@lru_memoize(capacity=32, ttl=60)
+def slow_square(x: int) -> int:
+    time.sleep(0.2)
+    return x * x
+
+@lru_memoize(capacity=32)
+async def slow_fetch(city: str, *, days: int = 1) -> str:
+    await asyncio.sleep(0.2)
+    return f"{city}:{days}"
+
+def demo() -> None:
+    # 8 wątków prosi o ten sam brakujący klucz - liczy tylko jeden
+    t0 = time.perf_counter()
+    threads = [threading.Thread(target=slow_square, args=(12,)) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    print(f"sync : {slow_square(12)} in {time.perf_counter() - t0:.2f}s ->", slow_square.cache_info())
+
+    async def run() -> list[str]:
+        return await asyncio.gather(*(slow_fetch("Warsaw", days=3) for _ in range(8)))
+
+    t0 = time.perf_counter()
+    out = asyncio.run(run())
+    print(f"async: {out[0]} x{len(out)} in {time.perf_counter() - t0:.2f}s ->", slow_fetch.cache_info())
+
+if __name__ == "__main__":
+    demo()
@@ -0,0 +1,178 @@
+from __future__ import annotations
+import pickle
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from lru_cache import LRUCache
+
+_MISSING = object()
+
+
+class TieredCache:
+    """
+    Dwupoziomowy cache: LRUCache w pamięci + SQLite na dysku.
+        - wpis wyrzucony z pamięci trafia do bufora spill, zapisywanego
+          paczkami (executemany) do tabeli na dysku,
+        - trafienie na dysku promuje wpis z powrotem do pamięci,
+        - wątek w tle co compact_interval s przycina dysk do max_disk_entries
+          (najdawniej używane: atime = ostatni spill albo trafienie na dysku)
+          i oddaje wolne strony (incremental_vacuum),
+        - close() zrzuca całą pamięć na dysk -> ponowne otwarcie = ciepły start.
+    Klucze i wartości są serializowane przez pickle (klucze: str/int/tuple).
+    Kopia na dysku może być nieaktualna, ale pamięć jest sprawdzana pierwsza,
+    a każdy spill nadpisuje wiersz - więc get zawsze zwraca najnowszą wartość.
+    """
+    def __init__(self, capacity: int, path: str | Path, *,
+                 max_disk_entries: Optional[int] = None,
+                 spill_batch: int = 256,
+                 compact_interval: Optional[float] = 30.0):
+        self.path = Path(path)
+        self.max_disk_entries = max_disk_entries
+        self.spill_batch = spill_batch
+        self.disk_hits = 0
+        self._lock = threading.RLock()
+        self._spilled: Dict[Any, Any] = {}
+        self._touched: Dict[bytes, float] = {}  # klucz (pickle) -> czas trafienia na dysku, zapisywane paczkami
+        self.mem = LRUCache(capacity, on_evict=self._spill)
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA auto_vacuum=INCREMENTAL")  # działa tylko dla nowej bazy
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key BLOB PRIMARY KEY, value BLOB NOT NULL, atime REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_atime ON entries(atime)")
+
+        self._stop = threading.Event()
+        self._compactor: Optional[threading.Thread] = None
+        if compact_interval:
+            self._compactor = threading.Thread(
+                target=self._compact_loop, args=(compact_interval,), daemon=True)
+            self._compactor.start()
+
+    # --- warstwa dyskowa ---
+
+    def _spill(self, k: Any, v: Any) -> None:
+        self._spilled[k] = v
+        if len(self._spilled) >= self.spill_batch:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._spilled and not self._touched:
+            return
+        now = time.time()
+        rows = [(pickle.dumps(k), pickle.dumps(v), now) for k, v in self._spilled.items()]
+        self._db.execute("BEGIN")
+        self._db.executemany("UPDATE entries SET atime = ? WHERE key = ?",
+                             [(t, kb) for kb, t in self._touched.items()])
+        self._db.executemany("INSERT OR REPLACE INTO entries VALUES (?, ?, ?)", rows)
+        self._db.execute("COMMIT")
+        self._spilled.clear()
+        self._touched.clear()
+
+    def _load(self, k: Any) -> Any:
+        if k in self._spilled:
+            return self._spilled.pop(k)
+        kb = pickle.dumps(k)
+        row = self._db.execute("SELECT value FROM entries WHERE key = ?", (kb,)).fetchone()
+        if row is None:
+            return _MISSING
+        # odczyt też jest użyciem - atime aktualizowany przy najbliższym _flush, nie osobnym zapisem
+        self._touched[kb] = time.time()
+        if len(self._touched) >= self.spill_batch:
+            self._flush()
+        return pickle.loads(row[0])
+
+    def compact(self) -> int:
+        """Przycina dysk do max_disk_entries i zwalnia miejsce. Zwraca liczbę usuniętych."""
+        with self._lock:
+            self._flush()
+            removed = 0
+            if self.max_disk_entries is not None:
+                cur = self._db.execute(
+                    "DELETE FROM entries WHERE key IN ("
+                    " SELECT key FROM entries ORDER BY atime DESC LIMIT -1 OFFSET ?)",
+                    (self.max_disk_entries,))
+                removed = cur.rowcount
+            self._db.execute("PRAGMA incremental_vacuum")
+            self._db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            return removed
+
+    def _compact_loop(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            self.compact()
+
+    # --- API cache ---
+
+    def get(self, k: Any, default: Any = None) -> Any:
+        with self._lock:
+            v = self.mem.get(k, _MISSING)
+            if v is not _MISSING:
+                return v
+            v = self._load(k)
+            if v is _MISSING:
+                return default
+            self.disk_hits += 1
+            self.mem.put(k, v)  # promocja; może wypchnąć inny wpis na dysk
+            return v
+
+    def put(self, k: Any, v: Any) -> None:
+        with self._lock:
+            self._spilled.pop(k, None)
+            self.mem.put(k, v)
+
+    def __contains__(self, k: Any) -> bool:
+        with self._lock:
+            if k in self.mem or k in self._spilled:
+                return True
+            return self._db.execute(
+                "SELECT 1 FROM entries WHERE key = ?", (pickle.dumps(k),)).fetchone() is not None
+
+    def disk_size(self) -> int:
+        with self._lock:
+            self._flush()
+            return self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._compactor is not None:
+            self._compactor.join()
+        with self._lock:
+            for k, n in self.mem.map.items():
+                self._spilled[k] = n.v
+            self.mem.clear()
+            self._flush()
+            self._db.close()
+
+    def __enter__(self) -> "TieredCache":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.close()
+        return False
+
+
+def demo() -> None:
+    path = Path(tempfile.gettempdir()) / "tiered_cache_demo.sqlite"
+    path.unlink(missing_ok=True)
+    with TieredCache(100, path, max_disk_entries=5_000) as c:
+        for i in range(1_000):
+            c.put(f"user:{i}", {"id": i, "score": i * i})
+        print("mem:", len(c.mem), "| disk:", c.disk_size())
+        print("user:3 ->", c.get("user:3"), "| disk hits:", c.disk_hits)
+
+    # restart procesu: pamięć pusta, dane z dysku
+    with TieredCache(100, path) as c:
+        t0 = time.perf_counter()
+        hits = sum(c.get(f"user:{i}") is not None for i in range(1_000))
+        print(f"warm start: {hits}/1000 hits in {time.perf_counter() - t0:.3f}s, removed by compaction:", c.compact())
+
+if __name__ == "__main__":
+    demo()
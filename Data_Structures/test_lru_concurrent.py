@@ -0,0 +1,47 @@
+import threading
+
+from lru_concurrent import ShardedLRUCache, ThreadSafeLRUCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.t = 0.0
+
+    def __call__(self) -> float:
+        return self.t
+
+
+def _finishes(fn, timeout: float = 2.0) -> bool:
+    """Wątek-strażnik: zakleszczenie kończy się porażką testu, a nie zawieszeniem."""
+    t = threading.Thread(target=fn, daemon=True)
+    t.start()
+    t.join(timeout)
+    return not t.is_alive()
+
+
+def test_put_after_sweep_interval_does_not_deadlock():
+    clock = FakeClock()
+    c = ThreadSafeLRUCache(10, ttl=5, sweep_interval=1, clock=clock)
+    c.put("a", 1)
+    clock.t = 10  # "a" wygasło, a put uruchomi okresowe czyszczenie
+    assert _finishes(lambda: c.put("b", 2))
+    assert "a" not in c and c.get("b") == 2
+    assert c.stats.expirations == 1
+
+
+def test_sharded_put_after_sweep_interval_does_not_deadlock():
+    clock = FakeClock()
+    c = ShardedLRUCache(8, shards=2, ttl=5, clock=clock)
+    c.put("a", 1)
+    clock.t = 61  # domyślny sweep_interval = 60 s
+    assert _finishes(lambda: [c.put(k, k) for k in range(4)])
+    assert _finishes(c.expire)
+    assert len(c) == 4
+
+
+def test_sharded_default_shards_fit_small_capacity():
+    c = ShardedLRUCache(4)
+    for k in "abcdef":
+        c.put(k, k)
+    assert len(c) <= 4 and c.get("f") == "f"
+    assert len(ShardedLRUCache(100)._shards) == 8
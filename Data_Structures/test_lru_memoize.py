@@ -0,0 +1,84 @@
+import asyncio
+import threading
+import time
+
+from lru_memoize import lru_memoize
+
+
+def _finishes(fn, timeout: float = 2.0) -> bool:
+    """Wątek-strażnik: zakleszczenie kończy się porażką testu, a nie zawieszeniem."""
+    t = threading.Thread(target=fn, daemon=True)
+    t.start()
+    t.join(timeout)
+    return not t.is_alive()
+
+
+def test_sync_waiters_counted_as_coalesced_not_misses():
+    @lru_memoize()
+    def slow(x):
+        time.sleep(0.1)
+        return x * 2
+
+    threads = [threading.Thread(target=slow, args=(3,)) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    info = slow.cache_info()
+    assert (info.misses, info.coalesced, info.currsize) == (1, 4, 1)
+
+
+def test_sync_recursive_call_with_same_key_does_not_deadlock():
+    calls = []
+
+    @lru_memoize()
+    def f(x):
+        calls.append(x)
+        if len(calls) == 1:
+            return f(x) + 1  # ten sam klucz, gdy pierwsze obliczenie jest jeszcze w locie
+        return x
+
+    out = []
+    assert _finishes(lambda: out.append(f(1)))
+    assert out == [2] and f(1) == 2
+
+
+def test_async_coalesces_within_loop_and_works_across_loops():
+    @lru_memoize()
+    async def fetch(x):
+        await asyncio.sleep(0.2)
+        return x + 1
+
+    async def burst():
+        return await asyncio.gather(*(fetch(1) for _ in range(4)))
+
+    results, errors = [], []
+
+    def run():
+        try:
+            results.append(asyncio.run(burst()))
+        except BaseException as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run) for _ in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+    assert not errors
+    assert results == [[2] * 4, [2] * 4]
+    info = fetch.cache_info()
+    assert info.misses == 2 and info.coalesced == 6  # jeden lider na pętlę
+
+
+def test_async_recursive_call_with_same_key_does_not_deadlock():
+    calls = []
+
+    @lru_memoize()
+    async def f(x):
+        calls.append(x)
+        if len(calls) == 1:
+            return await f(x) + 1
+        return x
+
+    assert asyncio.run(asyncio.wait_for(f(1), 2)) == 2
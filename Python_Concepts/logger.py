@@ -1,4 +1,9 @@
 from __future__ import annotations
+import atexit
+from collections import deque
+import json
+import os
+import threading
 import time
 from datetime import datetime
 from functools import wraps
@@ -12,28 +17,346 @@ def _write(line: str) -> None:
     with LOG_FILE.open("a", encoding="utf-8") as f:
         f.write(line + "\n")
 
+def _format(item: str | tuple) -> str:
+    """Linia logu; krotka (ts, nazwa, dt) z log_time formatowana dopiero przy zapisie."""
+    if isinstance(item, str):
+        return item
+    ts, name, dt = item
+    return f"[{datetime.fromtimestamp(ts).isoformat(timespec='seconds')}] {name} took {dt:.6f}s"
+
+
+class BufferedWriter:
+    """
+    Zapis w tle: wywołanie tylko dokłada wpis do kolejki (deque.append jest atomowe),
+    wątek zapisuje paczkami co `flush_interval` s albo po `batch_size` wpisach,
+    oraz przy wyjściu z programu (atexit). Plik trzymany otwarty; po przekroczeniu
+    `max_bytes` rotacja: logs.txt -> logs.txt.1 -> ... -> logs.txt.<backup_count>.
+    Kolejka ograniczona: przy `max_pending` oczekujących wpisach write() zapisuje
+    paczkę sam, więc zablokowany dysk spowalnia wołających zamiast zużywać pamięć.
+    Po close() write() zapisuje synchronicznie (nic nie ginie).
+    """
+    def __init__(self, path: Path, *, batch_size: int = 1000, flush_interval: float = 0.5,
+                 max_bytes: int = 10 << 20, backup_count: int = 3, max_pending: int = 100_000) -> None:
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.max_pending = max(max_pending, batch_size)
+        self._size = 0
+        self._queue: deque[str | tuple] = deque()
+        self._wake = threading.Event()
+        self._lock = threading.Lock()  # jeden zapisujący naraz (wątek tła / flush())
+        self._closed = False
+        self._fh = None
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def write(self, item: str | tuple) -> None:
+        self._queue.append(item)
+        if self._closed:
+            # po close() nie ma już wątku ani atexit - zapis od razu, plik nie zostaje otwarty.
+            # Flaga sprawdzana po append: jeśli close() jeszcze nie ustawił _closed, jego flush() zapisze wpis
+            self.flush()
+            self._close_file()
+            return
+        n = len(self._queue)
+        if n >= self.max_pending:
+            self.flush()  # backpressure: gdy wątek tła nie nadąża (wolny dysk), zapisuje wołający
+        elif n >= self.batch_size:
+            self._wake.set()
+
+    def _run(self) -> None:
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def _open(self) -> None:
+        if self._fh is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._fh = self.path.open("a", encoding="utf-8")
+            self._size = self._fh.tell()
+
+    def flush(self) -> None:
+        with self._lock:
+            q = self._queue
+            n = len(q)
+            if not n:
+                return
+            self._open()
+            if not self.max_bytes:
+                self._fh.write("\n".join([_format(q.popleft()) for _ in range(n)]) + "\n")
+                self._fh.flush()
+                return
+            # rozmiar sprawdzany przed każdym wpisem (jak RotatingFileHandler) - plik nie przekracza
+            # max_bytes, chyba że pojedyncza linia jest dłuższa
+            parts: list[str] = []
+            size = self._size
+            for _ in range(n):
+                line = _format(q.popleft()) + "\n"
+                b = len(line.encode("utf-8"))
+                if size and size + b > self.max_bytes:
+                    self._fh.write("".join(parts))
+                    parts.clear()
+                    self._rotate()
+                    self._open()
+                    size = 0
+                parts.append(line)
+                size += b
+            self._fh.write("".join(parts))
+            self._fh.flush()
+            self._size = size
+
+    def _rotate(self) -> None:
+        self._fh.close()
+        self._fh = None
+        for i in range(self.backup_count - 1, 0, -1):
+            src = self.path.with_name(f"{self.path.name}.{i}")
+            if src.exists():
+                os.replace(src, self.path.with_name(f"{self.path.name}.{i + 1}"))
+        if self.backup_count:
+            os.replace(self.path, self.path.with_name(f"{self.path.name}.1"))
+        else:
+            self.path.unlink()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._thread.join()
+        self.flush()
+        self._close_file()
+        atexit.unregister(self.close)
+
+    def _close_file(self) -> None:
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+
+
+class _SyncWriter:
+    """Dotychczasowe zachowanie: każda linia od razu do LOG_FILE (open/close za każdym razem)."""
+    def write(self, item: str | tuple) -> None:
+        _write(_format(item))
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+_sink: _SyncWriter | BufferedWriter = _SyncWriter()
+
+def configure(mode: str = "sync", path: str | Path | None = None, **options: Any) -> None:
+    """
+    mode="sync"     - zapis linia po linii (domyślnie, jak dotąd),
+    mode="buffered" - BufferedWriter; options: batch_size, flush_interval, max_bytes, backup_count, max_pending.
+    Działa też dla funkcji udekorowanych wcześniej.
+    """
+    global _sink, LOG_FILE
+    if mode not in ("sync", "buffered"):
+        raise ValueError(f"Unknown logging mode: {mode!r}")
+    _sink.close()
+    if path is not None:
+        LOG_FILE = Path(path)
+    _sink = BufferedWriter(LOG_FILE, **options) if mode == "buffered" else _SyncWriter()
+
+def flush() -> None:
+    _sink.flush()
+
+
+class LatencyHistogram:
+    """
+    Strumieniowy histogram czasów (ns) z kubełkami logarytmicznymi jak w HDR:
+    wartości < 2**(SUB_BITS+1) dokładnie, większe z błędem względnym < 2**-SUB_BITS (~0.8%).
+    record() to kilka operacji na intach i inkrementacja w liście - bez alokacji.
+    Bez blokady: przy równoległych wywołaniach z wielu wątków pojedyncze zliczenia mogą
+    rzadko przepaść (świadomy kompromis - pomiar nie może kosztować więcej niż funkcja).
+    """
+    SUB_BITS = 7
+
+    def __init__(self) -> None:
+        self.counts = [0] * ((64 + 2) << self.SUB_BITS)
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def record(self, ns: int) -> None:
+        shift = ns.bit_length() - self.SUB_BITS - 1
+        self.counts[((shift << self.SUB_BITS) + (ns >> shift)) if shift > 0 else ns] += 1
+        self.count += 1
+        self.total_ns += ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+
+    @classmethod
+    def _upper(cls, idx: int) -> int:
+        """Największa wartość (ns) trafiająca do kubełka idx."""
+        if idx < 2 << cls.SUB_BITS:
+            return idx
+        shift = (idx >> cls.SUB_BITS) - 1
+        return ((idx - (shift << cls.SUB_BITS) + 1) << shift) - 1
+
+    def percentile(self, p: float) -> int:
+        """Wartość (ns), poniżej lub równa której jest p% pomiarów (górna granica kubełka)."""
+        if not self.count:
+            return 0
+        rank = max(1, -(-self.count * p // 100))  # ceil
+        seen = 0
+        for idx, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank:
+                return min(self._upper(idx), self.max_ns)
+        return self.max_ns
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.total_ns += other.total_ns
+        self.max_ns = max(self.max_ns, other.max_ns)
+
+    def summary(self) -> dict[str, float]:
+        """Liczba wywołań i czasy w sekundach."""
+        return {
+            "count": self.count,
+            "mean": self.total_ns / self.count / 1e9 if self.count else 0.0,
+            "p50": self.percentile(50) / 1e9,
+            "p95": self.percentile(95) / 1e9,
+            "p99": self.percentile(99) / 1e9,
+            "max": self.max_ns / 1e9,
+        }
+
+
+_histograms: dict[str, LatencyHistogram] = {}
+_timing = "lines"  # "lines" | "histogram" | "both"
+_dumper: threading.Thread | None = None
+_dump_stop = threading.Event()
+
+def _histogram(name: str) -> LatencyHistogram:
+    return _histograms.setdefault(name, LatencyHistogram())
+
+def timing_stats(name: str | None = None) -> dict[str, Any]:
+    """Podsumowanie histogramów: {funkcja: {count, mean, p50, p95, p99, max}} albo jednej funkcji."""
+    if name is not None:
+        return _histograms[name].summary()
+    return {n: h.summary() for n, h in _histograms.items() if h.count}
+
+def reset_timing_stats() -> None:
+    for h in _histograms.values():
+        h.__init__()
+
+def dump_timing_stats(path: str | Path) -> None:
+    """Zapis JSON (atomowo: plik tymczasowy + os.replace)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps({"time": datetime.now().isoformat(timespec="seconds"),
+                               "functions": timing_stats()}, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+
+def configure_timing(mode: str = "lines", dump_path: str | Path | None = None, dump_interval: float = 60.0) -> None:
+    """
+    Co robi @log_time:
+    mode="lines"     - linia w logu na każde wywołanie (domyślnie, jak dotąd),
+    mode="histogram" - tylko histogram w pamięci (timing_stats()),
+    mode="both"      - jedno i drugie.
+    dump_path: co dump_interval s (i przy wyjściu) zapis timing_stats() do JSON.
+    """
+    global _timing, _dumper
+    if mode not in ("lines", "histogram", "both"):
+        raise ValueError(f"Unknown timing mode: {mode!r}")
+    _timing = mode
+    if _dumper is not None:
+        _dump_stop.set()
+        _dumper.join()
+        _dumper = None
+    if dump_path is not None:
+        _dump_stop.clear()
+
+        def run() -> None:
+            while not _dump_stop.wait(dump_interval):
+                dump_timing_stats(dump_path)
+            dump_timing_stats(dump_path)
+
+        _dumper = threading.Thread(target=run, name="timing-dump", daemon=True)
+        _dumper.start()
+        atexit.unregister(_stop_dumper)
+        atexit.register(_stop_dumper)
+
+def _stop_dumper() -> None:
+    if _dumper is not None:
+        _dump_stop.set()
+        _dumper.join()
+
 def log_time(fn: Callable) -> Callable:
-    """Mierzy czas wykonania funkcji i loguje do pliku."""
+    """Mierzy czas wykonania funkcji i loguje do pliku (albo do histogramu, patrz configure_timing)."""
+    hist = _histogram(f"{fn.__module__}.{fn.__qualname__}")
+
     @wraps(fn)
     def wrapper(*args, **kwargs):
-        t0 = time.perf_counter()
+        t0 = time.perf_counter_ns()
         try:
             return fn(*args, **kwargs)
         finally:
-            dt = time.perf_counter() - t0
-            _write(f"[{datetime.now().isoformat(timespec='seconds')}] {fn.__name__} took {dt:.6f}s")
+            dt = time.perf_counter_ns() - t0
+            if _timing != "lines":
+                hist.record(dt)
+            if _timing != "histogram":
+                _sink.write((time.time(), fn.__name__, dt / 1e9))
     return wrapper
 
 def log_calls(fn: Callable) -> Callable:
     """Loguje nazwę funkcji, argumenty i wynik."""
     @wraps(fn)
     def wrapper(*args, **kwargs):
-        _write(f"CALL {fn.__name__} args={args} kwargs={kwargs}")
+        _sink.write(f"CALL {fn.__name__} args={args} kwargs={kwargs}")  # repr teraz - argumenty mogą się zmienić
         result = fn(*args, **kwargs)
-        _write(f"RET  {fn.__name__} -> {result!r}")
+        _sink.write(f"RET  {fn.__name__} -> {result!r}")
         return result
     return wrapper
 
+def benchmark(calls: int = 100_000, sync_calls: int = 5_000) -> dict[str, float]:
+    """Narzut dekoratora w µs na wywołanie (pusta funkcja), tryb sync vs buffered."""
+    import tempfile
+    global LOG_FILE
+    saved = LOG_FILE
+
+    def noop(a, b):
+        return a
+
+    res = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode, n in (("sync", sync_calls), ("buffered", calls)):
+            configure(mode, Path(tmp) / f"{mode}.txt")
+            for name, deco in (("log_time", log_time), ("log_calls", log_calls)):
+                f = deco(noop)
+                t0 = time.perf_counter()
+                for i in range(n):
+                    f(i, 2)
+                res[f"{name} {mode}"] = (time.perf_counter() - t0) / n * 1e6
+            t0 = time.perf_counter()
+            flush()
+            res[f"flush {mode} (ms)"] = (time.perf_counter() - t0) * 1e3
+        configure("sync")
+    configure_timing("histogram")
+    f = log_time(noop)
+    t0 = time.perf_counter()
+    for i in range(calls):
+        f(i, 2)
+    res["log_time histogram"] = (time.perf_counter() - t0) / calls * 1e6
+    configure_timing("lines")
+    t0 = time.perf_counter()
+    for i in range(calls):
+        noop(i, 2)
+    res["bare call"] = (time.perf_counter() - t0) / calls * 1e6
+    LOG_FILE = saved
+    return res
+
 # --- DEMO ---
 @log_time
 def slow_add(a: int, b: int) -> int:
@@ -51,4 +374,15 @@ def demo():
     print(f"Log zapisany w {LOG_FILE.resolve()}")
 
 if __name__ == "__main__":
-    demo()
+    import sys
+    if "--bench" in sys.argv[1:]:
+        for name, us in benchmark().items():
+            print(f"{name:<22} {us:8.2f}" + ("" if "ms" in name else " µs/call"))
+    else:
+        if "--buffered" in sys.argv[1:]:
+            configure("buffered")
+        if "--histogram" in sys.argv[1:]:
+            configure_timing("histogram")
+        demo()
+        if "--histogram" in sys.argv[1:]:
+            print(json.dumps(timing_stats(), indent=2))
@@ -1,9 +1,13 @@
 from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+import os
 import random
 import string
 from functools import wraps
 from typing import Iterator
 
+SYMBOLS = "!@#$%^&*()-_=+[]{};:,.?/"
+
 # --- Dekoratory walidujące ---
 def validate_length(fn):
     @wraps(fn)
@@ -32,11 +36,7 @@ def generate_password(length: int = 12, *,
                       use_upper: bool = True,
                       use_digits: bool = True,
                       use_symbols: bool = True) -> str:
-    pools = []
-    if use_lower:   pools.append(string.ascii_lowercase)
-    if use_upper:   pools.append(string.ascii_uppercase)
-    if use_digits:  pools.append(string.digits)
-    if use_symbols: pools.append("!@#$%^&*()-_=+[]{};:,.?/")
+    pools = _pools(use_lower, use_upper, use_digits, use_symbols)
     rng = random.SystemRandom()
     # co najmniej 1 znak z każdej wybranej puli
     out = [rng.choice(pool) for pool in pools]
@@ -45,20 +45,91 @@ def generate_password(length: int = 12, *,
     rng.shuffle(out)
     return "".join(out)
 
+def _pools(use_lower: bool, use_upper: bool, use_digits: bool, use_symbols: bool) -> list[str]:
+    pools = []
+    if use_lower:   pools.append(string.ascii_lowercase)
+    if use_upper:   pools.append(string.ascii_uppercase)
+    if use_digits:  pools.append(string.digits)
+    if use_symbols: pools.append(SYMBOLS)
+    return pools
+
+# --- Masowe generowanie: bloki os.urandom + translate zamiast choice() na znak ---
+class _CharSource:
+    """
+    Losowe znaki z alfabetu (<= 256 znaków ascii) bez obciążenia:
+    bajt b < limit (wielokrotność len(alfabetu)) -> alfabet[b % m], bajty >= limit odrzucane.
+    Mapowanie i odrzucanie to jedno bytes.translate na cały blok (w C), jeden syscall na blok.
+    """
+    def __init__(self, alphabet: str, block: int = 1 << 16):
+        m = len(alphabet)
+        if not 1 <= m <= 256:
+            raise ValueError("alphabet must have 1..256 characters")
+        self.limit = 256 - 256 % m
+        raw = alphabet.encode("ascii")
+        self._table = bytes(raw[b % m] for b in range(self.limit)) + bytes(256 - self.limit)
+        self._reject = bytes(range(self.limit, 256))
+        self._block = block
+        self._buf = ""
+
+    def take(self, k: int) -> str:
+        while len(self._buf) < k:
+            # z zapasem na odrzucone bajty: oczekiwanie k * 256 / limit
+            size = max(self._block, (k - len(self._buf)) * 256 // self.limit + 64)
+            self._buf += os.urandom(size).translate(self._table, self._reject).decode("ascii")
+        out, self._buf = self._buf[:k], self._buf[k:]
+        return out
+
+def _generate_chunk(n: int, length: int, pools: list[str]) -> list[str]:
+    """n haseł z alfabetu wszystkich pul; hasło bez znaku z którejś puli jest losowane od nowa."""
+    src = _CharSource("".join(pools))
+    # klasa znaku (indeks puli) - sprawdzenie "każda pula obecna" przez set() na hasło
+    classes = str.maketrans({c: chr(i) for i, pool in enumerate(pools) for c in pool})
+    k = len(pools)
+    out: list[str] = []
+    while len(out) < n:
+        need = n - len(out)
+        # odrzucenie całych haseł zostawia rozkład jednostajny po poprawnych hasłach
+        chars = src.take(need * length)
+        cls = chars.translate(classes)
+        out += [chars[i:i + length] for i in range(0, len(chars), length)
+                if len(set(cls[i:i + length])) == k]
+    return out[:n]
+
+@validate_length
+@require_types
+def _validated_pools(length: int = 12, *, use_lower: bool = True, use_upper: bool = True,
+                   use_digits: bool = True, use_symbols: bool = True) -> list[str]:
+    return _pools(use_lower, use_upper, use_digits, use_symbols)  # walidacja raz na całe zadanie
+
+def generate_many(n: int, length: int = 12, *, use_lower: bool = True, use_upper: bool = True,
+                  use_digits: bool = True, use_symbols: bool = True, workers: int = 1) -> list[str]:
+    """
+    n haseł jak generate_password (min. 1 znak z każdej wybranej puli), ale losowanie blokami.
+    workers > 1 -> równoległe procesy (każdy z własnym os.urandom).
+    """
+    pools = _validated_pools(length, use_lower=use_lower, use_upper=use_upper,
+                           use_digits=use_digits, use_symbols=use_symbols)
+    if workers <= 1 or n < 10_000:
+        return _generate_chunk(n, length, pools)
+    parts = [n // workers + (i < n % workers) for i in range(workers)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        chunks = pool.map(_generate_chunk, parts, [length] * workers, [pools] * workers)
+        return [p for chunk in chunks for p in chunk]
+
 # --- Iterator klasowy: nieskończony strumień haseł ---
 class PasswordStream:
     def __init__(self, length: int = 12):
         if length < 8:
             raise ValueError("length must be >= 8")
         self.length = length
-        self._rng = random.SystemRandom()
         self._chars = string.ascii_letters + string.digits
+        self._src = _CharSource(self._chars)  # bufor z os.urandom zamiast choice() na znak
 
     def __iter__(self) -> Iterator[str]:
         return self
 
     def __next__(self) -> str:
-        return "".join(self._rng.choice(self._chars) for _ in range(self.length))
+        return self._src.take(self.length)
 
 # --- DEMO ---
 def demo():
@@ -69,5 +140,26 @@ def demo():
     for i, pwd in zip(range(3), stream):
         print(f"{i+1}: {pwd}")
 
+def benchmark(n: int = 20_000, length: int = 16) -> dict[str, float]:
+    """Hasła/s: generate_password w pętli (choice na znak) vs generate_many."""
+    import time
+    res = {}
+    t0 = time.perf_counter()
+    for _ in range(n):
+        generate_password(length)
+    res["generate_password loop"] = n / (time.perf_counter() - t0)
+    t0 = time.perf_counter()
+    generate_many(n, length)
+    res["generate_many"] = n / (time.perf_counter() - t0)
+    t0 = time.perf_counter()
+    generate_many(n * 10, length, workers=os.cpu_count() or 1)
+    res[f"generate_many workers={os.cpu_count()}"] = n * 10 / (time.perf_counter() - t0)
+    return res
+
 if __name__ == "__main__":
-    demo()
+    import sys
+    if "--bench" in sys.argv[1:]:
+        for name, rate in benchmark().items():
+            print(f"{name:<26} {rate:12,.0f} passwords/s")
+    else:
+        demo()
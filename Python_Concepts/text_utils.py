@@ -1,6 +1,11 @@
 from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import mmap
+from pathlib import Path
 import re
-from typing import Iterator
+import sys
+from typing import BinaryIO, Callable, Iterable, Iterator
 
 #REGEX
 _EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
@@ -25,13 +30,44 @@ _PL_TRANSLATION = str.maketrans({
 
 #zamiana polskich znaków + białe znaki
 def normalize(text: str) -> str:
+    # split() bez argumentu tnie po tych samych białych znakach co \s (str.isspace)
+    return " ".join(text.translate(_PL_TRANSLATION).split())
+
+#małe litery, polskie znaki, myślniki
+def slugify(text: str) -> str:
+    # jedno translate: polskie -> ascii, białe znaki -> "-", reszta ascii spoza [a-z0-9-] -> usunięta;
+    # encode("ascii", "ignore") usuwa pozostałe znaki spoza ascii
+    t = text.lower().translate(_SLUG_TABLE).encode("ascii", "ignore").decode("ascii")
+    if "--" in t:
+        t = _DASHES_RE.sub("-", t)
+    return t.strip("-")
+
+_WHITESPACE = [chr(c) for c in range(0x3001) if chr(c).isspace()]  # ostatni biały znak Unicode to U+3000
+_SLUG_TABLE = str.maketrans({
+    **{chr(c): None for c in range(128) if not re.match(r"[a-z0-9\s-]", chr(c))},
+    **{ws: "-" for ws in _WHITESPACE},
+    **{chr(k).lower(): v.lower() for k, v in _PL_TRANSLATION.items()},
+})
+_DASHES_RE = re.compile(r"-{2,}")
+
+#wersje do masowego przetwarzania; cache > 0 -> pamięć ostatnich wyników (powtarzające się tytuły)
+def normalize_many(texts: Iterable[str], cache: int = 0) -> Iterator[str]:
+    return map(_cached(normalize, cache), texts)
+
+def slugify_many(texts: Iterable[str], cache: int = 0) -> Iterator[str]:
+    return map(_cached(slugify, cache), texts)
+
+def _cached(fn: Callable[[str], str], size: int) -> Callable[[str], str]:
+    return lru_cache(maxsize=size)(fn) if size else fn
+
+#pierwotne wersje (4 x re.sub) - punkt odniesienia dla benchmarku
+def _normalize_regex(text: str) -> str:
     out = text.translate(_PL_TRANSLATION)
     out = re.sub(r"\s+", " ", out).strip()
     return out
 
-#małe litery, polskie znaki, myślniki
-def slugify(text: str) -> str:
-    t = normalize(text).lower()
+def _slugify_regex(text: str) -> str:
+    t = _normalize_regex(text).lower()
     t = re.sub(r"[^a-z0-9 -]", "", t)
     t = re.sub(r"\s+", "-", t)
     t = re.sub(r"-{2,}", "-", t).strip("-")
@@ -49,6 +85,113 @@ def chunked_words(text: str, n: int) -> Iterator[list[str]]:
         yield buf
 
 
+#--- wersje strumieniowe (pliki wielo-GB, stdin) ---
+# Tekst dzielony jest tylko na białych znakach ascii - ani e-mail, ani słowo ich nie zawiera,
+# więc żadne dopasowanie nie przecina granicy kawałka. Ze strumienia zostaje "ogon" po ostatnim
+# białym znaku i jest doklejany do następnego kawałka (zakładka).
+
+_CUT_RE = re.compile(rb"[ \t\r\n]")
+_AT_RE = re.compile(rb"@")
+# bajty, które mogą wystąpić w e-mailu (\x80-\xff = litery spoza ascii w UTF-8)
+_EMAIL_RUN_RE = re.compile(rb"[\w.+\-@\x80-\xff]*")
+# Tyle bajtów przed "@" bierzemy pod uwagę (RFC: lokalna część <= 64). Celowa różnica względem
+# find_emails: dłuższa część lokalna jest obcinana do ostatnich MAX_EMAIL_PREFIX bajtów. Bez limitu
+# ciąg "aaa...a@" bez domeny kosztowałby w _EMAIL_RE czas kwadratowy względem długości ciągu.
+MAX_EMAIL_PREFIX = 512
+
+#e-maile z bufora (bytes / mmap) w [start, end): szukamy "@" i rozszerzamy ciąg dozwolonych bajtów
+#w obie strony, dopiero ten kawałek idzie do _EMAIL_RE - liniowo, także dla długich tokenów bez "@"
+def _emails_in(buf, start: int, end: int) -> list[str]:
+    out: list[str] = []
+    done = start
+    for at in _AT_RE.finditer(buf, start, end):
+        pos = at.start()
+        if pos < done:
+            continue  # ten sam ciąg co poprzedni "@"
+        lo = max(done, pos - MAX_EMAIL_PREFIX)
+        left = bytes(buf[lo:pos])[::-1]
+        run_start = pos - _EMAIL_RUN_RE.match(left).end()
+        done = _EMAIL_RUN_RE.match(buf, pos, end).end()
+        run = bytes(buf[run_start:done]).decode("utf-8", "replace")
+        out += [m.group(0) for m in _EMAIL_RE.finditer(run)]
+    return out
+
+def _words_in(buf, start: int, end: int, encoding: str = "utf-8") -> list[str]:
+    return _WORD_RE.findall(bytes(buf[start:end]).decode(encoding, "replace"))
+
+_SCANNERS = {"emails": _emails_in, "words": _words_in}
+
+#podział pliku na ~chunk_size zakresy kończące się na białym znaku
+def _cut_ranges(buf, chunk_size: int) -> list[tuple[int, int]]:
+    size = len(buf)
+    ranges, start = [], 0
+    while start < size:
+        m = _CUT_RE.search(buf, min(start + chunk_size, size))
+        end = m.end() if m else size
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+#worker procesu: mmap pliku, wyniki jednego zakresu (już bez powtórzeń, gdy unique)
+def _scan_range(kind: str, path: str, start: int, end: int, unique: bool) -> list[str]:
+    with open(path, "rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        found = _SCANNERS[kind](mm, start, end)
+    return list(dict.fromkeys(found)) if unique else found
+
+def _scan_file(kind: str, path: Path, chunk_size: int, workers: int, unique: bool) -> Iterator[list[str]]:
+    if path.stat().st_size == 0:
+        return
+    with path.open("rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        ranges = _cut_ranges(mm, chunk_size)
+        if workers <= 1:
+            for start, end in ranges:  # bez kopiowania całego pliku - regex działa wprost na mmap
+                yield _SCANNERS[kind](mm, start, end)
+            return
+    n = len(ranges)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # map oddaje wyniki w kolejności zakresów, gdy tylko kolejny jest gotowy
+        yield from pool.map(_scan_range, [kind] * n, [str(path)] * n, *zip(*ranges), [unique] * n)
+
+def _scan_stream(kind: str, stream: BinaryIO, chunk_size: int) -> Iterator[list[str]]:
+    scan = _SCANNERS[kind]
+    read = getattr(stream, "read1", stream.read)
+    tail = b""
+    while chunk := read(chunk_size):
+        buf = tail + chunk
+        cut = max(buf.rfind(b" "), buf.rfind(b"\n"), buf.rfind(b"\t"), buf.rfind(b"\r")) + 1
+        yield scan(buf, 0, cut)
+        tail = buf[cut:]  # niedokończony token czeka na resztę
+    if tail:
+        yield scan(tail, 0, len(tail))
+
+def _stream(kind: str, source: str | Path | BinaryIO, chunk_size: int, workers: int, unique: bool) -> Iterator[str]:
+    if isinstance(source, (str, Path)):
+        batches = _scan_file(kind, Path(source), chunk_size, workers, unique)
+    else:
+        batches = _scan_stream(kind, source, chunk_size)
+    if not unique:
+        for batch in batches:
+            yield from batch
+        return
+    seen: set[str] = set()
+    for batch in batches:
+        for item in batch:
+            if item not in seen:
+                seen.add(item)
+                yield item
+
+#e-maile z pliku (mmap, opcjonalnie pula procesów) albo strumienia binarnego; wyniki od razu, bez powtórzeń
+#uwaga: część lokalna dłuższa niż MAX_EMAIL_PREFIX bajtów zostaje obcięta (find_emails zwraca całą)
+def stream_emails(source: str | Path | BinaryIO, *, chunk_size: int = 1 << 24,
+                  workers: int = 1, unique: bool = True) -> Iterator[str]:
+    return _stream("emails", source, chunk_size, workers, unique)
+
+#słowa z pliku albo strumienia binarnego (UTF-8); unique=False -> wszystkie wystąpienia jak word_iterator
+def stream_words(source: str | Path | BinaryIO, *, chunk_size: int = 1 << 24,
+                 workers: int = 1, unique: bool = True) -> Iterator[str]:
+    return _stream("words", source, chunk_size, workers, unique)
+
+
 def demo():
     text = "To jest testowy tekst testowy@email.com, gdzie testujemy funkcję abcde@test.pl no i Klaudia, barbara@barbara.com"
     print("Emails: ", find_emails(text))
@@ -57,5 +200,32 @@ def demo():
     print("Slugify: ", slugify("  Mój Pierwszy Wpis!  "))
     print("Chunked words:", list(chunked_words("To jest test chunków słów", 2)))
 
+#tytuły z powtórzeniami (jak w zadaniach wsadowych); czasy w s dla n tytułów
+def benchmark(n: int = 200_000, distinct: int = 20_000, seed: int = 1) -> dict[str, float]:
+    import random
+    import time
+    rng = random.Random(seed)
+    vocab = ["Zażółć", "gęślą", "jaźń", "Mój", "Pierwszy", "Wpis!", "  ", "C++", "naïve", "--", "2024", "Łódź", "\t"]
+    pool = [" ".join(rng.choices(vocab, k=rng.randint(3, 10))) for _ in range(distinct)]
+    titles = rng.choices(pool, k=n)
+    assert [_slugify_regex(t) for t in pool] == list(slugify_many(pool))
+    runs = {
+        "slugify (4 x re.sub)": lambda: [_slugify_regex(t) for t in titles],
+        "slugify_many": lambda: list(slugify_many(titles)),
+        "slugify_many cache": lambda: list(slugify_many(titles, cache=distinct)),
+        "normalize (re.sub)": lambda: [_normalize_regex(t) for t in titles],
+        "normalize_many": lambda: list(normalize_many(titles)),
+    }
+    res = {}
+    for name, fn in runs.items():
+        t0 = time.perf_counter()
+        fn()
+        res[name] = time.perf_counter() - t0
+    return res
+
 if __name__ == "__main__":
-    demo()
\ No newline at end of file
+    if "--bench" in sys.argv[1:]:
+        for name, sec in benchmark().items():
+            print(f"{name:<22} {sec:6.3f} s")
+    else:
+        demo()
\ No newline at end of file
@@ -0,0 +1,227 @@
+from __future__ import annotations
+import argparse
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+import csv
+from dataclasses import dataclass, field
+import io
+from itertools import islice
+import json
+import os
+from pathlib import Path
+import sys
+import time
+from typing import Callable, Iterator, Sequence
+
+from user_filter import is_adult, valid_email
+
+# Strumieniowe filtrowanie milionów rekordów użytkowników z plików JSONL / CSV.
+# Plik czytany paczkami, paczki filtrowane (is_adult, valid_email, ...) w puli procesów,
+# wynik zapisywany w kolejności wejścia. W locie jest najwyżej 2 * workers paczek -> pamięć stała.
+#     python user_pipeline.py users.jsonl adults.csv --fields name,email --workers 4
+
+PREDICATES: dict[str, Callable[[dict], bool]] = {"is_adult": is_adult, "valid_email": valid_email}
+
+
+@dataclass
+class PipelineStats:
+    records_in: int = 0
+    records_out: int = 0
+    errors: int = 0  # rekordy, na których predykat rzucił wyjątek (np. age="abc")
+    bytes_in: int = 0  # znaki wejścia (= bajty dla ASCII)
+    seconds: float = 0.0
+    started: float = field(default_factory=time.perf_counter, repr=False)
+
+    @property
+    def records_per_s(self) -> float:
+        return self.records_in / self.seconds if self.seconds else 0.0
+
+    @property
+    def mb_per_s(self) -> float:
+        return self.bytes_in / (1 << 20) / self.seconds if self.seconds else 0.0
+
+    def __str__(self) -> str:
+        return (f"{self.records_in} in, {self.records_out} out, {self.errors} errors, "
+                f"{self.seconds:.2f} s, {self.records_per_s:,.0f} rec/s, {self.mb_per_s:.1f} MB/s")
+
+
+def _fmt(path: str | Path) -> str:
+    suffix = Path(path).suffix.lower()
+    if suffix in (".jsonl", ".ndjson"):
+        return "jsonl"
+    if suffix == ".csv":
+        return "csv"
+    raise ValueError(f"Unsupported file type: {path} (use .jsonl or .csv)")
+
+
+#paczki surowych rekordów: linie JSONL albo wiersze CSV (csv.reader w C; pola mogą mieć \n w cudzysłowie)
+#drugi element: liczba przeczytanych znaków (~bajtów) do raportu przepustowości
+def read_chunks(path: str | Path, chunk_size: int = 20_000) -> Iterator[tuple[list, int]]:
+    fmt = _fmt(path)
+    with open(path, "r", encoding="utf-8", newline="") as fh:
+        if fmt == "jsonl":
+            while lines := list(islice(fh, chunk_size)):
+                yield lines, sum(map(len, lines))
+            return
+        read = 0
+
+        def counted(lines):
+            nonlocal read
+            for ln in lines:
+                read += len(ln)
+                yield ln
+
+        reader = csv.reader(counted(fh))
+        next(reader, None)  # nagłówek - patrz _csv_header
+        while chunk := list(islice(reader, chunk_size)):
+            yield chunk, read
+            read = 0
+
+def _csv_header(path: str | Path) -> list[str]:
+    with open(path, "r", encoding="utf-8", newline="") as fh:
+        return next(csv.reader(fh), [])
+
+
+#worker: parsowanie, predykaty, projekcja i serializacja w procesie potomnym - do rodzica wraca gotowy tekst
+def _process_chunk(records: list, header: list[str] | None, predicates: Sequence[str],
+                   fields: Sequence[str] | None, out_fmt: str) -> tuple[str, int, int, int]:
+    preds = [PREDICATES[p] for p in predicates]
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=fields, extrasaction="ignore", lineterminator="\n") if out_fmt == "csv" else None
+    n_in = n_out = errors = 0
+    for rec in records:
+        if not rec or rec == "\n":
+            continue
+        n_in += 1
+        try:
+            user = json.loads(rec) if header is None else dict(zip(header, rec))
+            if not all(p(user) for p in preds):
+                continue
+        except (ValueError, TypeError, AttributeError):
+            errors += 1
+            continue
+        n_out += 1
+        if writer is not None:
+            writer.writerow(user)
+        else:
+            row = {k: user.get(k) for k in fields} if fields else user
+            out.write(json.dumps(row, ensure_ascii=False))
+            out.write("\n")
+    return out.getvalue(), n_in, n_out, errors
+
+
+def _csv_fields(src: str | Path, fields: Sequence[str] | None) -> list[str]:
+    """Kolumny wyjściowego CSV: projekcja albo nagłówek / klucze pierwszego rekordu wejścia."""
+    if fields:
+        return list(fields)
+    if _fmt(src) == "csv":
+        return _csv_header(src)
+    with open(src, "r", encoding="utf-8") as fh:
+        first = next((ln for ln in fh if ln.strip()), "{}")
+        return list(json.loads(first))
+
+
+def run(src: str | Path, dst: str | Path, *, predicates: Sequence[str] = ("is_adult", "valid_email"),
+        fields: Sequence[str] | None = None, workers: int = os.cpu_count() or 1, chunk_size: int = 20_000,
+        progress: Callable[[PipelineStats], None] | None = None, progress_every: float = 2.0) -> PipelineStats:
+    """
+    Filtruje src -> dst (format wg rozszerzenia). workers <= 1 -> bez puli procesów.
+    progress(stats) wołane co progress_every s - do raportowania przepustowości w trakcie.
+    """
+    unknown = set(predicates) - PREDICATES.keys()
+    if unknown:
+        raise ValueError(f"Unknown predicates: {sorted(unknown)}")
+    out_fmt = _fmt(dst)
+    out_fields = _csv_fields(src, fields) if out_fmt == "csv" else fields
+    stats = PipelineStats()
+    last_report = stats.started
+    tmp = Path(dst).with_name(Path(dst).name + ".part")
+
+    def consume(result: tuple[str, int, int, int], out) -> None:
+        nonlocal last_report
+        text, n_in, n_out, errors = result
+        out.write(text)
+        stats.records_in += n_in
+        stats.records_out += n_out
+        stats.errors += errors
+        now = time.perf_counter()
+        stats.seconds = now - stats.started
+        if progress and now - last_report >= progress_every:
+            last_report = now
+            progress(stats)
+
+    try:
+        _run_into(tmp, src, out_fmt, out_fields, predicates, workers, chunk_size, stats, consume)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    os.replace(tmp, dst)  # niedokończony wynik nie nadpisze poprzedniego pliku
+    stats.seconds = time.perf_counter() - stats.started
+    return stats
+
+
+def _run_into(tmp: Path, src: str | Path, out_fmt: str, out_fields: Sequence[str] | None,
+              predicates: Sequence[str], workers: int, chunk_size: int, stats: PipelineStats,
+              consume: Callable) -> None:
+    with open(tmp, "w", encoding="utf-8", newline="") as out:
+        if out_fmt == "csv":
+            csv.writer(out, lineterminator="\n").writerow(out_fields)
+        header = _csv_header(src) if _fmt(src) == "csv" else None
+        args = (header, tuple(predicates), out_fields, out_fmt)
+        if workers <= 1:
+            for chunk, size in read_chunks(src, chunk_size):
+                stats.bytes_in += size
+                consume(_process_chunk(chunk, *args), out)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                inflight: deque[Future] = deque()
+                for chunk, size in read_chunks(src, chunk_size):
+                    stats.bytes_in += size
+                    inflight.append(pool.submit(_process_chunk, chunk, *args))
+                    if len(inflight) >= 2 * workers:  # ograniczenie pamięci: czekamy na najstarszą paczkę
+                        consume(inflight.popleft().result(), out)
+                while inflight:
+                    consume(inflight.popleft().result(), out)
+
+
+def make_sample(path: str | Path, n: int = 1_000_000, seed: int = 5) -> Path:
+    """Syntetyczny plik użytkowników (JSONL albo CSV wg rozszerzenia)."""
+    import random
+    rng = random.Random(seed)
+    domains = ["example.com", "company.io", "site", "mail.pl"]
+    path = Path(path)
+    with path.open("w", encoding="utf-8", newline="") as fh:
+        csv_out = csv.writer(fh, lineterminator="\n") if _fmt(path) == "csv" else None
+        if csv_out:
+            csv_out.writerow(["name", "email", "age"])
+        for i in range(n):
+            user = {"name": f"user{i}", "email": f"u{i}@{rng.choice(domains)}", "age": rng.randint(0, 90)}
+            if csv_out:
+                csv_out.writerow(user.values())
+            else:
+                fh.write(json.dumps(user) + "\n")
+    return path
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Filter user records from JSONL/CSV files")
+    ap.add_argument("src", help="input .jsonl or .csv")
+    ap.add_argument("dst", help="output .jsonl or .csv")
+    ap.add_argument("--filters", default="is_adult,valid_email", help=f"comma-separated: {', '.join(PREDICATES)}")
+    ap.add_argument("--fields", help="comma-separated fields to keep")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--chunk-size", type=int, default=20_000, help="records per chunk")
+    ap.add_argument("--sample", type=int, metavar="N", help="first write N synthetic users to src")
+    args = ap.parse_args()
+
+    if args.sample:
+        make_sample(args.src, args.sample)
+    stats = run(args.src, args.dst,
+                predicates=[p for p in args.filters.split(",") if p],
+                fields=args.fields.split(",") if args.fields else None,
+                workers=args.workers, chunk_size=args.chunk_size,
+                progress=lambda s: print(f"... {s}", file=sys.stderr))
+    print(stats, file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from array import array
+from dataclasses import dataclass
+from itertools import compress
+import operator
+import re
+import sys
+from typing import Callable, Iterable, Iterator
+
+from user_filter import EMAIL_RE, is_adult, valid_email
+
+# Tabela kolumnowa użytkowników: wiek jako array('i') + kopia w bajtach (0..255),
+# poprawność e-maila jako bitmapa liczona raz przy budowie.
+# Filtr to maska bitowa (int: bit i = wiersz i) - &, |, ~ na milionach wierszy liczą się w C.
+#     t = UserTable.from_users(users)
+#     t.names("age >= 18 & valid_email")
+#     t.count((Col("age") < 30) | ~Flag("valid_email"))
+
+_OPS: dict[str, Callable[[int, int], bool]] = {
+    ">=": operator.ge, "<=": operator.le, ">": operator.gt,
+    "<": operator.lt, "==": operator.eq, "!=": operator.ne,
+}
+_TO_FLAGS = bytes.maketrans(b"01", b"\x00\x01")
+
+
+class Expr(ABC):
+    """Węzeł wyrażenia filtra; eval() zwraca maskę bitową wierszy."""
+    @abstractmethod
+    def eval(self, table: "UserTable") -> int:
+        ...
+
+    def __and__(self, other: "Expr") -> "Expr":
+        return _BinOp(operator.and_, self, other)
+
+    def __or__(self, other: "Expr") -> "Expr":
+        return _BinOp(operator.or_, self, other)
+
+    def __invert__(self) -> "Expr":
+        return _Not(self)
+
+
+@dataclass
+class Col:
+    """Kolumna liczbowa; porównanie ze stałą daje Expr (w Pythonie: (Col("age") >= 18) & ...)."""
+    name: str
+
+    def __ge__(self, v: int) -> Expr: return _Cmp(self.name, ">=", v)
+    def __le__(self, v: int) -> Expr: return _Cmp(self.name, "<=", v)
+    def __gt__(self, v: int) -> Expr: return _Cmp(self.name, ">", v)
+    def __lt__(self, v: int) -> Expr: return _Cmp(self.name, "<", v)
+    def __eq__(self, v: int) -> Expr: return _Cmp(self.name, "==", v)  # type: ignore[override]
+    def __ne__(self, v: int) -> Expr: return _Cmp(self.name, "!=", v)  # type: ignore[override]
+
+
+@dataclass
+class Flag(Expr):
+    """Kolumna logiczna (bitmapa), np. valid_email."""
+    name: str
+
+    def eval(self, table: "UserTable") -> int:
+        try:
+            return table.flags[self.name]
+        except KeyError:
+            raise ValueError(f"Unknown flag column: {self.name!r}") from None
+
+
+@dataclass
+class _Cmp(Expr):
+    column: str
+    op: str
+    value: int
+
+    def eval(self, table: "UserTable") -> int:
+        return table.compare(self.column, self.op, self.value)
+
+
+@dataclass
+class _BinOp(Expr):
+    fn: Callable[[int, int], int]
+    left: Expr
+    right: Expr
+
+    def eval(self, table: "UserTable") -> int:
+        return self.fn(self.left.eval(table), self.right.eval(table))
+
+
+@dataclass
+class _Not(Expr):
+    inner: Expr
+
+    def eval(self, table: "UserTable") -> int:
+        return table.all_rows ^ self.inner.eval(table)
+
+
+# --- DSL tekstowy: "age >= 18 & valid_email", "~valid_email | (age < 16)" ---
+# Priorytety jak w SQL: porównanie > ~ > & > |  (inaczej niż operatory Pythona)
+
+_TOKEN_RE = re.compile(r"\s*(?:(\d+)|(\w+)|(>=|<=|==|!=|[<>&|~()]))")
+
+def parse(query: str) -> Expr:
+    tokens: list[str] = []
+    pos = 0
+    query = query.strip()
+    while pos < len(query):
+        m = _TOKEN_RE.match(query, pos)
+        if not m:
+            raise ValueError(f"Unexpected character at {pos}: {query[pos:]!r}")
+        tokens.append(m.group(m.lastindex))
+        pos = m.end()
+    tokens.append("")  # koniec
+    i = 0
+
+    def peek() -> str:
+        return tokens[i]
+
+    def take(expected: str | None = None) -> str:
+        nonlocal i
+        tok = tokens[i]
+        if expected is not None and tok != expected:
+            raise ValueError(f"Expected {expected or 'end of query'!r}, got {tok or 'end of query'!r}")
+        i += 1
+        return tok
+
+    def or_expr() -> Expr:
+        e = and_expr()
+        while peek() == "|":
+            take()
+            e = e | and_expr()
+        return e
+
+    def and_expr() -> Expr:
+        e = unary()
+        while peek() == "&":
+            take()
+            e = e & unary()
+        return e
+
+    def unary() -> Expr:
+        tok = take()
+        if tok == "~":
+            return ~unary()
+        if tok == "(":
+            e = or_expr()
+            take(")")
+            return e
+        if not tok.isidentifier():
+            raise ValueError(f"Expected column name, got {tok or 'end of query'!r}")
+        if peek() in _OPS:
+            op = take()
+            value = take()
+            if not value.isdigit():
+                raise ValueError(f"Expected integer after {op!r}, got {value!r}")
+            return _Cmp(tok, op, int(value))
+        return Flag(tok)
+
+    expr = or_expr()
+    take("")
+    return expr
+
+
+class UserTable:
+    """Kolumnowa, niezmienna tabela użytkowników; budowana raz, zapytania jako maski bitowe."""
+    def __init__(self, names: list[str], emails: list[str], ages: array) -> None:
+        self.names_col = names
+        self.emails_col = emails
+        self.numeric: dict[str, array] = {"age": ages}
+        self.all_rows = (1 << len(ages)) - 1
+        self._bytes: dict[str, bytes] = {}
+        self.flags: dict[str, int] = {"valid_email": self._bitmap(EMAIL_RE.match(e.strip()) is not None for e in emails)}
+
+    @classmethod
+    def from_users(cls, users: Iterable[dict]) -> "UserTable":
+        names, emails, ages = [], [], array("i")
+        for u in users:
+            names.append(u.get("name", ""))
+            emails.append(u.get("email") or "")
+            ages.append(int(u.get("age", 0)))  # int() raz, przy budowie
+        return cls(names, emails, ages)
+
+    def __len__(self) -> int:
+        return len(self.names_col)
+
+    @staticmethod
+    def _bitmap(bits: Iterable[bool]) -> int:
+        return int("".join("1" if b else "0" for b in bits)[::-1] or "0", 2)
+
+    def compare(self, column: str, op: str, value: int) -> int:
+        """Maska wierszy, dla których `column op value`."""
+        try:
+            col, fn = self.numeric[column], _OPS[op]
+        except KeyError:
+            raise ValueError(f"Unknown numeric column or operator: {column!r} {op!r}") from None
+        if column not in self._bytes:
+            try:  # kopia w bajtach tylko gdy wszystkie wartości mieszczą się w 0..255
+                self._bytes[column] = array("B", col).tobytes()
+            except OverflowError:
+                self._bytes[column] = b""
+        raw = self._bytes[column]
+        if not raw and len(col):
+            return self._bitmap(fn(v, value) for v in col)  # wolna ścieżka dla nietypowych wartości
+        # tablica 256 bajtów: wartość -> b"1"/b"0"; translate + int(..., 2) są liniowe i w C
+        table = bytes(b"01"[fn(v, value)] for v in range(256))
+        return int(raw.translate(table)[::-1] or b"0", 2)
+
+    def mask(self, query: str | Expr) -> int:
+        return (parse(query) if isinstance(query, str) else query).eval(self)
+
+    def count(self, query: str | Expr) -> int:
+        return self.mask(query).bit_count()
+
+    def _flags(self, mask: int) -> bytes:
+        """Maska -> bajty 0/1 (jeden na wiersz) dla itertools.compress."""
+        return format(mask, f"0{len(self)}b")[::-1].encode().translate(_TO_FLAGS)
+
+    def indices(self, query: str | Expr) -> list[int]:
+        return list(compress(range(len(self)), self._flags(self.mask(query))))
+
+    def names(self, query: str | Expr) -> list[str]:
+        return list(compress(self.names_col, self._flags(self.mask(query))))
+
+    def rows(self, query: str | Expr) -> Iterator[dict]:
+        ages = self.numeric["age"]
+        for i in self.indices(query):
+            yield {"name": self.names_col[i], "email": self.emails_col[i], "age": ages[i]}
+
+
+def benchmark(n: int = 1_000_000, seed: int = 3) -> dict[str, float]:
+    """Sekundy: funkcje per-dict z user_filter vs maski UserTable (budowa liczona osobno)."""
+    import random
+    import time
+    rng = random.Random(seed)
+    domains = ["example.com", "company.io", "site", "mail.pl", ""]
+    users = [{"name": f"user{i}", "email": f"u{i}@{rng.choice(domains)}", "age": str(rng.randint(0, 90))}
+             for i in range(n)]
+    res: dict[str, float] = {}
+
+    def timed(name: str, fn: Callable[[], object]) -> object:
+        t0 = time.perf_counter()
+        out = fn()
+        res[name] = time.perf_counter() - t0
+        return out
+
+    expected = timed("list[dict] filter", lambda: [u["name"] for u in users if is_adult(u) and valid_email(u)])
+    table = timed("UserTable build (once)", lambda: UserTable.from_users(users))
+    got = timed("UserTable names(query)", lambda: table.names("age >= 18 & valid_email"))
+    assert got == expected
+    timed("UserTable count(query)", lambda: table.count("age >= 18 & valid_email"))
+    timed("UserTable 10 queries", lambda: [table.count(f"age >= {a} & valid_email | age < 5") for a in range(10, 20)])
+    return res
+
+
+def demo():
+    users = [
+        {"name": "Anna", "email": "anna@example.com", "age": 22},
+        {"name": "Jan", "email": "invalid@", "age": 17},
+        {"name": "Marta", "email": "marta.dev@company.io", "age": 19},
+        {"name": "Piotr", "email": "piotr@site", "age": 30},
+    ]
+    t = UserTable.from_users(users)
+    print("Dorośli z poprawnym e-mailem:", t.names("age >= 18 & valid_email"))
+    print("Niepełnoletni lub zły e-mail:", t.names((Col("age") < 18) | ~Flag("valid_email")))
+    print("Liczba 18-25:", t.count("age >= 18 & age <= 25"))
+
+if __name__ == "__main__":
+    if "--bench" in sys.argv[1:]:
+        for name, sec in benchmark().items():
+            print(f"{name:<26} {sec:7.3f} s")
+    else:
+        demo()